@@ -1,4 +1,4 @@
-from flask import Flask, render_template, request, send_file, jsonify
+from flask import Flask, Request, render_template, request, send_file, jsonify
 import os
 import struct
 import numpy as np
@@ -7,18 +7,56 @@ from werkzeug.utils import secure_filename
 import logging
 import binascii
 import io
+import itertools
+import mmap
+import re
+from contextlib import contextmanager
 from config import Config
 
+class UploadSpool(tempfile.SpooledTemporaryFile):
+    """SpooledTemporaryFile that records when it rolls over to disk
+    
+    While the upload is held in memory it has no file descriptor, and
+    fileno() says so instead of writing the upload out to get one.
+    """
+    
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._on_disk = False
+    
+    def rollover(self):
+        super().rollover()
+        self._on_disk = True
+    
+    def in_memory(self):
+        """Return True until the upload rolls over to a temporary file on disk"""
+        return not self._on_disk
+    
+    def fileno(self):
+        if self.in_memory():
+            raise io.UnsupportedOperation("upload is held in memory")
+        return super().fileno()
+
+def upload_stream_factory(total_content_length, content_type, filename, content_length=None):
+    """Return the UploadSpool an uploaded file is written to"""
+    # Werkzeug spills anything over 500KB to disk; only spill large uploads
+    return UploadSpool(max_size=app.config['UPLOAD_SPOOL_SIZE'], mode='rb+')
+
+class SpooledUploadRequest(Request):
+    """Request that keeps uploads up to UPLOAD_SPOOL_SIZE in memory"""
+    
+    def make_form_data_parser(self):
+        parser = super().make_form_data_parser()
+        parser.stream_factory = upload_stream_factory
+        return parser
+
 app = Flask(__name__)
+app.request_class = SpooledUploadRequest
 app.config.from_object(Config)
 
 # Increase maximum file size to 500MB
 app.config['MAX_CONTENT_LENGTH'] = 500 * 1024 * 1024  # 500MB max file size
 
-# Ensure directories exist
-os.makedirs(app.config['UPLOAD_FOLDER'], exist_ok=True)
-os.makedirs(app.config['OUTPUT_FOLDER'], exist_ok=True)
-
 # Configure detailed logging for reverse engineering
 logging.basicConfig(
     level=getattr(logging, app.config['LOG_LEVEL']),
@@ -30,9 +68,92 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# ASCII STL text for a single facet: normal (3 floats) then three vertices (9 floats)
+# (bytes, so formatting produces output that can be written directly)
+ASCII_FACET_TEMPLATE = (
+    b"  facet normal %.6f %.6f %.6f\n"
+    b"    outer loop\n"
+    b"      vertex %.6f %.6f %.6f\n"
+    b"      vertex %.6f %.6f %.6f\n"
+    b"      vertex %.6f %.6f %.6f\n"
+    b"    endloop\n"
+    b"  endfacet\n"
+)
+
+# The ASCII header: at most its first 101 lines (the safety cap), and the
+# line that ends it, exactly endHeader once surrounding whitespace is stripped
+HEADER_LINES_RE = re.compile(rb'(?:[^\n]*\n){0,100}[^\n]*\n?')
+HEADER_END_RE = re.compile(rb'^[ \t\r\x0b\x0c\x1c-\x1f]*endHeader[ \t\r\x0b\x0c\x1c-\x1f]*$', re.MULTILINE)
+
+# Header keyword -> (metadata key, log label, value parser)
+HEADER_FIELDS = {
+    'units': ('units', 'Units', lambda values: values[0]),
+    'modelDimensions': ('dimensions', 'Model dimensions', lambda values: [float(v) for v in values[:3]]),
+    'numVoxels': ('numVoxels', 'Number of voxels', lambda values: int(values[0])),
+    'numTris': ('numTris', 'Number of triangles', lambda values: int(values[0])),
+    'bitmap': ('bitmap', 'Bitmap info', lambda values: [int(values[0]), int(values[1])]),
+    'fileVersion': ('fileVersion', 'File version', lambda values: int(values[0]))
+}
+
+# Precompiled little-endian field formats
+FLOAT32 = struct.Struct('<f')
+UINT32 = struct.Struct('<I')
+
+# Runs of 4+ printable ASCII characters that do not start or end with a space
+ASCII_MARKER_RE = re.compile(rb'[\x21-\x7e][\x20-\x7e]{2,}[\x21-\x7e]')
+
+# Trailing .cly extension of an uploaded file name, in any case
+CLY_SUFFIX_RE = re.compile(r'\.cly\Z', re.IGNORECASE)
+
+# Binary STL triangle record: normal, three vertices, attribute byte count (50 bytes)
+STL_TRIANGLE_DTYPE = np.dtype([
+    ('normal', '<f4', (3,)),
+    ('vertices', '<f4', (3, 3)),
+    ('attr', '<u2')
+])
+
+# Placeholder box: unit cube corners and the 12 triangles covering its sides
+UNIT_CUBE_VERTICES = np.array([
+    [0, 0, 0], [1, 0, 0], [1, 1, 0], [0, 1, 0],
+    [0, 0, 1], [1, 0, 1], [1, 1, 1], [0, 1, 1]
+], dtype=np.float64)
+UNIT_CUBE_VERTICES.setflags(write=False)
+
+CUBE_FACES = np.array([
+    [0, 1, 2], [0, 2, 3],  # bottom
+    [4, 5, 6], [4, 6, 7],  # top
+    [0, 1, 5], [0, 5, 4],  # front
+    [2, 3, 7], [2, 7, 6],  # back
+    [1, 2, 6], [1, 6, 5],  # right
+    [0, 3, 7], [0, 7, 4]   # left
+], dtype=np.int32)
+CUBE_FACES.setflags(write=False)
+
+def scan_vertex_candidates(buffer, length, bound=10000):
+    """Find 12-byte float32 triplets that look like vertex coordinates
+    
+    Every 12-byte window starting in the first `length` bytes of `buffer` is
+    decoded in one NumPy pass, without copying the buffer. Returns the byte
+    offsets of the windows whose coordinates are finite and within +/-bound,
+    along with their (N, 3) positions.
+    """
+    row_count = min(len(buffer) // 12, -(-length // 12))
+    xyz = np.frombuffer(buffer, dtype='<f4', count=row_count * 3).reshape(-1, 3)
+    
+    # NaN and +/-inf never compare below the bound, so one predicate also
+    # rules out non-finite values
+    reasonable = (np.abs(xyz) < bound).all(axis=1)
+    rows = np.flatnonzero(reasonable)
+    
+    # Fancy indexing copies, so no view of the buffer escapes
+    return rows * 12, xyz[rows]
+
 class CLYParser:
-    def __init__(self, file_path):
+    def __init__(self, file_path, stream=None):
+        # When a binary stream is given it is parsed instead of opening
+        # file_path, which is then only used as a name in the logs
         self.file_path = file_path
+        self.stream = stream
         self.vertices = []
         self.faces = []
         self.metadata = {}
@@ -46,10 +167,14 @@ class CLYParser:
     
     def analyze_binary_structure(self, data, offset, length=100):
         """Analyze binary data structure for reverse engineering"""
-        logger.info(f"=== Binary Structure Analysis at offset {offset} ===")
+        # Everything below only feeds INFO logging; skip the work when it is off
+        if not logger.isEnabledFor(logging.INFO):
+            return
+        
+        logger.info("=== Binary Structure Analysis at offset %s ===", offset)
         
         # Look for patterns
-        logger.info(f"First {length} bytes as hex: {self.hex_dump(data[offset:offset+length])}")
+        logger.info("First %s bytes as hex: %s", length, self.hex_dump(data[offset:offset+length]))
         
         # Try to find ASCII strings
         ascii_chars = []
@@ -60,7 +185,7 @@ class CLYParser:
             else:
                 ascii_chars.append('.')
         
-        logger.info(f"ASCII representation: {''.join(ascii_chars)}")
+        logger.info("ASCII representation: %s", ''.join(ascii_chars))
         
         # Look for potential float values (4 bytes)
         if len(data) - offset >= 16:
@@ -68,8 +193,8 @@ class CLYParser:
             for i in range(0, min(16, len(data) - offset), 4):
                 if i + 4 <= len(data) - offset:
                     try:
-                        float_val = struct.unpack('<f', data[offset+i:offset+i+4])[0]
-                        logger.info(f"  Offset {offset+i}: {float_val}")
+                        float_val = FLOAT32.unpack_from(data, offset + i)[0]
+                        logger.info("  Offset %s: %s", offset + i, float_val)
                     except:
                         pass
         
@@ -79,121 +204,137 @@ class CLYParser:
             for i in range(0, min(16, len(data) - offset), 4):
                 if i + 4 <= len(data) - offset:
                     try:
-                        int_val = struct.unpack('<I', data[offset+i:offset+i+4])[0]
-                        logger.info(f"  Offset {offset+i}: {int_val}")
+                        int_val = UINT32.unpack_from(data, offset + i)[0]
+                        logger.info("  Offset %s: %s", offset + i, int_val)
                     except:
                         pass
     
-    def parse_header(self):
-        """Parse the ASCII header of the .cly file"""
+    @classmethod
+    def from_fileobj(cls, fileobj, name='<stream>'):
+        """Create a parser for an open binary file object
+        
+        An UploadSpool still held in memory has no file descriptor to map,
+        so it is parsed from its contents instead of being written to disk.
+        """
+        return cls(name, stream=fileobj)
+    
+    @contextmanager
+    def _open(self):
+        """Open the .cly source for binary reading, positioned at the start"""
+        if self.stream is None:
+            with open(self.file_path, 'rb') as f:
+                yield f
+        else:
+            # The caller owns the stream, so rewind it but leave it open
+            self.stream.seek(0)
+            yield self.stream
+    
+    @contextmanager
+    def _map(self, f):
+        """Yield a read-only buffer over the whole of file object f"""
+        if f.seek(0, os.SEEK_END) == 0:
+            # mmap refuses empty files
+            yield b''
+            return
+        
+        try:
+            fileno = f.fileno()
+        except (AttributeError, io.UnsupportedOperation):
+            fileno = None
+        
+        if fileno is not None:
+            # Map the file instead of reading it all into memory; pages are
+            # only loaded as they are touched
+            with mmap.mmap(fileno, 0, access=mmap.ACCESS_READ) as buffer:
+                yield buffer
+        elif hasattr(f, 'getbuffer'):
+            with f.getbuffer() as buffer:
+                yield buffer
+        else:
+            f.seek(0)
+            yield f.read()
+    
+    def parse_header(self, buffer):
+        """Parse the ASCII header at the start of the .cly file buffer"""
         logger.info("=== Parsing CLY Header ===")
         
-        with open(self.file_path, 'rb') as f:
-            header_lines = []
-            line_count = 0
-            
-            while True:
-                line = f.readline().decode('utf-8', errors='ignore').strip()
-                header_lines.append(line)
-                line_count += 1
-                
-                logger.info(f"Header line {line_count}: {line}")
-                
-                if line == 'endHeader':
-                    break
-                if line_count > 100:  # Safety check
-                    logger.warning("Header parsing stopped - too many lines")
-                    break
-            
-            # Parse metadata
-            for line in header_lines:
-                if line.startswith('units'):
-                    self.metadata['units'] = line.split()[1]
-                    logger.info(f"Units: {self.metadata['units']}")
-                elif line.startswith('modelDimensions'):
-                    parts = line.split()
-                    self.metadata['dimensions'] = [float(parts[1]), float(parts[2]), float(parts[3])]
-                    logger.info(f"Model dimensions: {self.metadata['dimensions']}")
-                elif line.startswith('numVoxels'):
-                    self.metadata['numVoxels'] = int(line.split()[1])
-                    logger.info(f"Number of voxels: {self.metadata['numVoxels']}")
-                elif line.startswith('numTris'):
-                    self.metadata['numTris'] = int(line.split()[1])
-                    logger.info(f"Number of triangles: {self.metadata['numTris']}")
-                elif line.startswith('bitmap'):
-                    parts = line.split()
-                    self.metadata['bitmap'] = [int(parts[1]), int(parts[2])]
-                    logger.info(f"Bitmap info: {self.metadata['bitmap']}")
-                elif line.startswith('fileVersion'):
-                    self.metadata['fileVersion'] = int(line.split()[1])
-                    logger.info(f"File version: {self.metadata['fileVersion']}")
-            
-            start_pos = f.tell()
-            logger.info(f"Header ends at position: {start_pos}")
-            return start_pos
+        # Scan for the terminator instead of reading line by line, but never
+        # past the first 101 lines
+        lines_end = HEADER_LINES_RE.match(buffer).end()
+        match = HEADER_END_RE.search(buffer, 0, lines_end)
+        if match:
+            # Header runs through the end of the endHeader line
+            start_pos = min(match.end() + 1, len(buffer))
+        else:
+            # Safety check: no terminator, cap the header at 101 lines
+            logger.warning("Header parsing stopped - endHeader not found")
+            start_pos = lines_end
+        
+        header_text = bytes(buffer[:start_pos]).decode('utf-8', errors='ignore')
+        header_lines = [line.strip() for line in header_text.split('\n')]
+        if header_text.endswith('\n'):
+            header_lines.pop()
+        for line_count, line in enumerate(header_lines, 1):
+            logger.info("Header line %s: %s", line_count, line)
+        
+        # Parse metadata
+        for line in header_lines:
+            parts = line.split()
+            field = HEADER_FIELDS.get(parts[0]) if parts else None
+            if field:
+                key, label, parse_value = field
+                self.metadata[key] = parse_value(parts[1:])
+                logger.info("%s: %s", label, self.metadata[key])
+        
+        logger.info("Header ends at position: %s", start_pos)
+        return start_pos
     
-    def parse_binary_data(self, start_pos):
-        """Parse the binary mesh data with detailed logging"""
+    def parse_binary_data(self, buffer, start_pos):
+        """Parse the binary mesh data following the header, with detailed logging"""
         logger.info("=== Parsing Binary Data ===")
         
-        with open(self.file_path, 'rb') as f:
-            f.seek(start_pos)
-            
-            # Read first chunk for analysis
+        if len(buffer) <= start_pos:
+            logger.warning("No binary data found after header")
+            self.create_placeholder_mesh()
+            return
+        
+        # Work on a view so the body is never copied; it is released before
+        # the caller closes the buffer it slices
+        with memoryview(buffer)[start_pos:] as data:
+            # Analyze first chunk
             chunk_size = 1024
-            first_chunk = f.read(chunk_size)
-            logger.info(f"First {chunk_size} bytes of binary data:")
-            self.analyze_binary_structure(first_chunk, 0, chunk_size)
-            
-            # Look for known markers
-            f.seek(start_pos)
-            data = f.read()
+            logger.info("First %s bytes of binary data:", chunk_size)
+            self.analyze_binary_structure(data[:chunk_size], 0, chunk_size)
             
             # Search for ASCII markers in binary data
             logger.info("=== Searching for ASCII markers ===")
-            ascii_markers = []
-            for i in range(len(data) - 10):
-                chunk = data[i:i+10]
-                try:
-                    text = chunk.decode('ascii', errors='ignore')
-                    if text.isprintable() and len(text.strip()) > 3:
-                        ascii_markers.append((i, text.strip()))
-                except:
-                    pass
+            # Only the first 20 are used, so stop scanning once they are found
+            ascii_markers = [(m.start(), m.group().decode('ascii'))
+                             for m in itertools.islice(ASCII_MARKER_RE.finditer(data), 20)]
             
             # Log found markers
-            for offset, marker in ascii_markers[:20]:  # Limit to first 20
-                logger.info(f"ASCII marker at offset {offset}: '{marker}'")
+            for offset, marker in ascii_markers:
+                logger.info("ASCII marker at offset %s: '%s'", offset, marker)
             
             # Analyze structure around known markers
             if ascii_markers:
                 logger.info("=== Analyzing structure around markers ===")
                 for offset, marker in ascii_markers[:5]:
                     if offset + 100 < len(data):
-                        logger.info(f"Structure around '{marker}' at offset {offset}:")
+                        logger.info("Structure around '%s' at offset %s:", marker, offset)
                         self.analyze_binary_structure(data, offset, 100)
             
             # Try to find potential vertex data
             logger.info("=== Looking for potential vertex data ===")
             # Look for sequences of 12 bytes (3 floats for x,y,z)
-            potential_vertices = []
-            for i in range(0, min(len(data), 1000), 12):
-                if i + 12 <= len(data):
-                    try:
-                        x, y, z = struct.unpack('<fff', data[i:i+12])
-                        # Check if values are reasonable (not NaN, not too large)
-                        if all(-10000 < val < 10000 for val in [x, y, z]) and \
-                           not any(np.isnan(val) for val in [x, y, z]):
-                            potential_vertices.append((i, x, y, z))
-                    except:
-                        pass
-            
-            logger.info(f"Found {len(potential_vertices)} potential vertex candidates")
-            for i, (offset, x, y, z) in enumerate(potential_vertices[:10]):
-                logger.info(f"  Vertex {i}: offset {offset}, pos ({x:.3f}, {y:.3f}, {z:.3f})")
+            offsets, positions = scan_vertex_candidates(data, 1000)
             
-            # For now, create a placeholder mesh based on metadata
-            self.create_placeholder_mesh()
+            logger.info("Found %s potential vertex candidates", len(offsets))
+            for i, (offset, (x, y, z)) in enumerate(zip(offsets[:10].tolist(), positions[:10].tolist())):
+                logger.info("  Vertex %s: offset %s, pos (%.3f, %.3f, %.3f)", i, offset, x, y, z)
+        
+        # For now, create a placeholder mesh based on metadata
+        self.create_placeholder_mesh()
     
     def create_placeholder_mesh(self):
         """Create a placeholder mesh based on metadata"""
@@ -202,120 +343,99 @@ class CLYParser:
         # Use metadata to create a reasonable placeholder
         if 'dimensions' in self.metadata:
             dims = self.metadata['dimensions']
-            logger.info(f"Creating placeholder mesh with dimensions: {dims}")
-            
-            # Create a simple box with the given dimensions
-            x, y, z = dims[0], dims[1], dims[2]
-            
-            vertices = np.array([
-                [0, 0, 0], [x, 0, 0], [x, y, 0], [0, y, 0],
-                [0, 0, z], [x, 0, z], [x, y, z], [0, y, z]
-            ])
-            
-            faces = np.array([
-                [0, 1, 2], [0, 2, 3],  # bottom
-                [4, 5, 6], [4, 6, 7],  # top
-                [0, 1, 5], [0, 5, 4],  # front
-                [2, 3, 7], [2, 7, 6],  # back
-                [1, 2, 6], [1, 6, 5],  # right
-                [0, 3, 7], [0, 7, 4]   # left
-            ])
-            
-            self.vertices = vertices
-            self.faces = faces
-            
-            logger.info(f"Created placeholder mesh with {len(vertices)} vertices and {len(faces)} faces")
+            logger.info("Creating placeholder mesh with dimensions: %s", dims)
         else:
             # Fallback to unit cube
             logger.warning("No dimensions found, creating unit cube")
-            vertices = np.array([
-                [0, 0, 0], [1, 0, 0], [1, 1, 0], [0, 1, 0],
-                [0, 0, 1], [1, 0, 1], [1, 1, 1], [0, 1, 1]
-            ])
-            
-            faces = np.array([
-                [0, 1, 2], [0, 2, 3],  # bottom
-                [4, 5, 6], [4, 6, 7],  # top
-                [0, 1, 5], [0, 5, 4],  # front
-                [2, 3, 7], [2, 7, 6],  # back
-                [1, 2, 6], [1, 6, 5],  # right
-                [0, 3, 7], [0, 7, 4]   # left
-            ])
-            
-            self.vertices = vertices
-            self.faces = faces
+            dims = [1, 1, 1]
+        
+        # Scale the shared unit cube; the face topology is always the same
+        self.vertices = UNIT_CUBE_VERTICES * np.asarray(dims[:3], dtype=np.float64)
+        self.faces = CUBE_FACES
+        
+        logger.info("Created placeholder mesh with %s vertices and %s faces", len(self.vertices), len(self.faces))
     
     def parse(self):
         """Parse the entire .cly file with comprehensive logging"""
         logger.info("=== Starting CLY File Parsing ===")
-        logger.info(f"File: {self.file_path}")
-        logger.info(f"File size: {os.path.getsize(self.file_path)} bytes")
+        logger.info("File: %s", self.file_path)
         
         try:
-            start_pos = self.parse_header()
-            self.parse_binary_data(start_pos)
+            # Open and map the source once for both the header and the body
+            with self._open() as f, self._map(f) as buffer:
+                logger.info("File size: %s bytes", len(buffer))
+                
+                start_pos = self.parse_header(buffer)
+                self.parse_binary_data(buffer, start_pos)
             
             logger.info("=== Parsing Summary ===")
-            logger.info(f"Metadata: {self.metadata}")
-            logger.info(f"Vertices: {len(self.vertices)}")
-            logger.info(f"Faces: {len(self.faces)}")
+            logger.info("Metadata: %s", self.metadata)
+            logger.info("Vertices: %s", len(self.vertices))
+            logger.info("Faces: %s", len(self.faces))
             
             return True
         except Exception as e:
-            logger.error(f"Error parsing .cly file: {e}", exc_info=True)
+            logger.error("Error parsing .cly file: %s", e, exc_info=True)
             return False
     
-    def export_stl(self, output_path, ascii_format=True):
-        """Export to STL format with logging"""
-        logger.info(f"=== Exporting to STL ===")
-        logger.info(f"Output path: {output_path}")
-        logger.info(f"Format: {'ASCII' if ascii_format else 'Binary'}")
+    def _facet_data(self):
+        """Return per-face vertex triplets (F, 3, 3) and unit normals (F, 3)"""
+        vertices = np.asarray(self.vertices, dtype=np.float64).reshape(-1, 3)
+        faces = np.asarray(self.faces, dtype=np.intp).reshape(-1, 3)
+        
+        # Batched cross product over all faces instead of one face at a time
+        triangles = vertices[faces]
+        normals = np.cross(triangles[:, 1] - triangles[:, 0], triangles[:, 2] - triangles[:, 0])
+        normals /= np.linalg.norm(normals, axis=1, keepdims=True)
+        return triangles, normals
+    
+    def _write_stl(self, f, ascii_format):
+        """Write the mesh as STL to a binary file object"""
+        logger.info("Format: %s", 'ASCII' if ascii_format else 'Binary')
+        
+        triangles, normals = self._facet_data()
         
         if ascii_format:
-            with open(output_path, 'w') as f:
-                f.write("solid mesh\n")
-                for i, face in enumerate(self.faces):
-                    # Calculate normal
-                    v1, v2, v3 = self.vertices[face]
-                    normal = np.cross(v2 - v1, v3 - v1)
-                    normal = normal / np.linalg.norm(normal)
-                    
-                    f.write(f"  facet normal {normal[0]:.6f} {normal[1]:.6f} {normal[2]:.6f}\n")
-                    f.write("    outer loop\n")
-                    for vertex_idx in face:
-                        v = self.vertices[vertex_idx]
-                        f.write(f"      vertex {v[0]:.6f} {v[1]:.6f} {v[2]:.6f}\n")
-                    f.write("    endloop\n")
-                    f.write("  endfacet\n")
-                f.write("endsolid mesh\n")
+            # One row per face: normal followed by the three vertices
+            rows = np.hstack([normals, triangles.reshape(-1, 9)])
+            
+            f.write(b"solid mesh\n")
+            # map() keeps the per-facet formatting loop out of Python bytecode
+            f.writelines(map(ASCII_FACET_TEMPLATE.__mod__, map(tuple, rows.tolist())))
+            f.write(b"endsolid mesh\n")
         else:
-            # Binary STL
-            with open(output_path, 'wb') as f:
-                # Write header (80 bytes)
-                f.write(b'\x00' * 80)
-                
-                # Write number of triangles
-                f.write(struct.pack('<I', len(self.faces)))
-                
-                # Write each triangle
-                for i, face in enumerate(self.faces):
-                    # Calculate normal
-                    v1, v2, v3 = self.vertices[face]
-                    normal = np.cross(v2 - v1, v3 - v1)
-                    normal = normal / np.linalg.norm(normal)
-                    
-                    # Write normal
-                    f.write(struct.pack('<3f', normal[0], normal[1], normal[2]))
-                    
-                    # Write vertices
-                    for vertex_idx in face:
-                        v = self.vertices[vertex_idx]
-                        f.write(struct.pack('<3f', v[0], v[1], v[2]))
-                    
-                    # Write attribute byte count (0)
-                    f.write(struct.pack('<H', 0))
-        
-        logger.info(f"STL export completed: {len(self.faces)} faces written")
+            # Binary STL: assemble every 50-byte triangle record in one array
+            records = np.zeros(len(triangles), dtype=STL_TRIANGLE_DTYPE)
+            records['normal'] = normals
+            records['vertices'] = triangles
+            
+            # Write header (80 bytes)
+            f.write(b'\x00' * 80)
+            
+            # Write number of triangles
+            f.write(UINT32.pack(len(records)))
+            
+            # Write all triangles (attribute byte count stays 0)
+            f.write(records.tobytes())
+        
+        logger.info("STL export completed: %s faces written", len(self.faces))
+    
+    def export_stl(self, output_path, ascii_format=True):
+        """Export to STL format with logging"""
+        logger.info("=== Exporting to STL ===")
+        logger.info("Output path: %s", output_path)
+        
+        with open(output_path, 'wb') as f:
+            self._write_stl(f, ascii_format)
+    
+    def export_stl_to_buffer(self, ascii_format=True):
+        """Export to an in-memory STL file, rewound and ready to be sent"""
+        logger.info("=== Exporting to STL (in memory) ===")
+        
+        buffer = io.BytesIO()
+        self._write_stl(buffer, ascii_format)
+        buffer.seek(0)
+        return buffer
 
 @app.route('/')
 def index():
@@ -334,57 +454,51 @@ def upload_file():
         logger.error("No filename provided")
         return jsonify({'error': 'No file selected'}), 400
     
-    logger.info(f"Uploaded file: {file.filename}")
-    logger.info(f"File size: {len(file.read())} bytes")
-    file.seek(0)  # Reset file pointer
+    logger.info("Uploaded file: %s", file.filename)
+    # The upload is already spooled; seeking to its end gives the size
+    # without reading it (Content-Length covers the whole multipart body,
+    # and is missing for chunked requests)
+    logger.info("File size: %s bytes", file.stream.seek(0, os.SEEK_END))
+    if isinstance(file.stream, UploadSpool):
+        logger.info("Upload spooled %s", "in memory" if file.stream.in_memory() else "to disk")
     
-    if not file.filename.lower().endswith('.cly'):
-        logger.error(f"Invalid file type: {file.filename}")
+    if not CLY_SUFFIX_RE.search(file.filename):
+        logger.error("Invalid file type: %s", file.filename)
         return jsonify({'error': 'Please upload a .cly file'}), 400
     
     try:
-        # Save uploaded file
         filename = secure_filename(file.filename)
-        file_path = os.path.join(app.config['UPLOAD_FOLDER'], filename)
-        file.save(file_path)
         
-        logger.info(f"File saved to: {file_path}")
-        
-        # Parse the .cly file
-        parser = CLYParser(file_path)
+        # Parse the .cly file straight from the upload stream. It is already
+        # spooled (in memory, or to a temporary file when large), so saving
+        # another copy into UPLOAD_FOLDER first is not needed
+        parser = CLYParser.from_fileobj(file.stream, filename)
         if not parser.parse():
             logger.error("Failed to parse .cly file")
             return jsonify({'error': 'Failed to parse .cly file'}), 400
         
-        # Export to STL
-        output_filename = filename.replace('.cly', '.stl')
-        output_path = os.path.join(app.config['OUTPUT_FOLDER'], output_filename)
+        # Export to STL in memory; nothing is written to OUTPUT_FOLDER
+        output_filename = CLY_SUFFIX_RE.sub('.stl', filename)
         
         format_type = request.form.get('format', 'ascii')
         ascii_format = format_type == 'ascii'
         
-        logger.info(f"Converting to STL format: {format_type}")
-        parser.export_stl(output_path, ascii_format)
+        logger.info("Converting to STL format: %s", format_type)
+        stl_buffer = parser.export_stl_to_buffer(ascii_format)
         
-        logger.info(f"Conversion completed: {output_path}")
+        logger.info("Conversion completed: %s", output_filename)
         
         # Return the converted file
         return send_file(
-            output_path,
+            stl_buffer,
             as_attachment=True,
             download_name=output_filename,
             mimetype='application/octet-stream'
         )
         
     except Exception as e:
-        logger.error(f"Error processing file: {e}", exc_info=True)
+        logger.error("Error processing file: %s", e, exc_info=True)
         return jsonify({'error': f'Error processing file: {str(e)}'}), 500
-    
-    finally:
-        # Clean up uploaded file
-        if os.path.exists(file_path):
-            os.remove(file_path)
-            logger.info(f"Cleaned up uploaded file: {file_path}")
 
 if __name__ == '__main__':
     logger.info("=== Starting CLY to STL Converter ===")
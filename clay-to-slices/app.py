@@ -7,6 +7,15 @@ from werkzeug.utils import secure_filename
 import logging
 import binascii
 import io
+import gzip
+import hashlib
+import heapq
+import mmap
+import threading
+import re
+from collections import Counter, OrderedDict
+from contextlib import contextmanager
+from itertools import islice, repeat
 from config import Config
 import json
 from datetime import datetime
@@ -31,108 +40,313 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Header keyword -> (metadata key, log label, value parser)
+HEADER_FIELDS = {
+    'units': ('units', 'Units', lambda values: values[0]),
+    'modelDimensions': ('dimensions', 'Model dimensions', lambda values: [float(v) for v in values[:3]]),
+    'numVoxels': ('numVoxels', 'Number of voxels', lambda values: int(values[0])),
+    'numTris': ('numTris', 'Number of triangles', lambda values: int(values[0])),
+    'bitmap': ('bitmap', 'Bitmap info', lambda values: [int(values[0]), int(values[1])]),
+    'fileVersion': ('fileVersion', 'File version', lambda values: int(values[0]))
+}
+
+# Precompiled little-endian record formats used by the binary parsers
+UINT32 = struct.Struct('<I')
+FLOAT32 = struct.Struct('<f')
+CHUNK_HEADER = struct.Struct('<II')
+
+# One binary STL facet record: normal, three vertices, attribute byte count (50 bytes, unpadded)
+STL_FACET = np.dtype([('normal', '<f4', (3,)), ('vertices', '<f4', (3, 3)), ('attribute', '<u2')])
+
+# Output buffer for STL files, so large meshes go out in ~1 MiB writes
+STL_WRITE_BUFFER = 1 << 20
+
+# One ASCII STL facet, filled from a row of (normal, v1, v2, v3) coordinates
+ASCII_FACET = (
+    "  facet normal %.6f %.6f %.6f\n"
+    "    outer loop\n"
+    "      vertex %.6f %.6f %.6f\n"
+    "      vertex %.6f %.6f %.6f\n"
+    "      vertex %.6f %.6f %.6f\n"
+    "    endloop\n"
+    "  endfacet\n"
+)
+
+# Printable ASCII run followed by a null terminator, i.e. a candidate piece name
+PIECE_NAME_RE = re.compile(rb'[\x20-\x7e]{4,63}(?=\x00)')
+
+# Run of six or more printable ASCII bytes, reported as an ASCII marker
+ASCII_MARKER_RE = re.compile(rb'[\x20-\x7e]{6,}')
+
+# Run of four or more printable ASCII bytes, collected by the reverse engineering analysis
+ASCII_STRING_RE = re.compile(rb'[\x20-\x7e]{4,}')
+
+# Section markers the analysis report looks for, matched in a single pass
+KNOWN_MARKERS = ['FFDYNPKTObjectListMain', 'FFDYNPKTModelInfo', 'FFDYNPKTModelPreviewImage']
+KNOWN_MARKER_RE = re.compile(b'|'.join(re.escape(marker.encode('ascii')) for marker in KNOWN_MARKERS))
+
+# Filler patterns the analysis found near mesh data, matched in a single pass
+MESH_PATTERNS = [b'aaaaaaaa', b'!!!!!!!!', b'QQQQQQQQ']
+MESH_PATTERN_RE = re.compile(b'|'.join(re.escape(pattern) for pattern in MESH_PATTERNS))
+
+# FreeStyle "form" magic (666f726d); a regex so it can search memoryviews, which have no .find
+FORM_MAGIC_RE = re.compile(rb'form')
+
+# Signatures and chunk markers searched for by the reverse engineering analysis
+COMMON_MAGICS = (
+    b'CLYF', b'CLAY', b'CLY', b'3D', b'OBJ', b'STL',
+    b'\x00\x00\x00\x00', b'\xFF\xFF\xFF\xFF',
+    b'\x00\x00\x80\x3F', b'\x00\x00\x00\x40'  # Common float values
+)
+CHUNK_MARKERS = (b'\x00\x00\x00\x00', b'\xFF\xFF\xFF\xFF', b'\x00\x00\x00\x01')
+
+# Every distinct signature, each located once per buffer with bytes.find and
+# shared by both scans
+SIGNATURES = tuple(dict.fromkeys(COMMON_MAGICS + CHUNK_MARKERS))
+
+# Hits after which a 4-byte signature counts as dense; the rest of the buffer
+# is then compared against the every-byte uint32 view in one NumPy pass
+DENSE_SIGNATURE_HITS = 1024
+
+# Timestamp naming a saved analysis, as written by _save_analysis_results
+ANALYSIS_TIMESTAMP_RE = re.compile(r'\d{8}_\d{6}')
+
+# Trailing .cly extension of an uploaded file name, in any case
+CLY_SUFFIX_RE = re.compile(r'\.cly\Z', re.IGNORECASE)
+
+# bytes.translate table that keeps printable ASCII and maps everything else to '.'
+ASCII_DOTS = bytes(b if 32 <= b <= 126 else ord('.') for b in range(256))
+
+# Words examined per block by _find_mesh_sections, bounding its temporaries
+MESH_SCAN_BLOCK = 1 << 16
+
+# RecordList records expanded to dicts at a time while being written
+RECORD_BATCH = 10000
+
+# Bytes copied (and hashed) at a time when saving an upload
+UPLOAD_CHUNK = 1 << 20
+
+# Placeholder geometry shared by every fallback mesh; read-only so a
+# caller can never modify the cached copy in place. Integer, like the
+# original placeholder, so boxes scaled by the dimensions come out float64
+# and the ASCII export prints the dimensions exactly
+UNIT_CUBE_VERTICES = np.array([
+    [0, 0, 0], [1, 0, 0], [1, 1, 0], [0, 1, 0],
+    [0, 0, 1], [1, 0, 1], [1, 1, 1], [0, 1, 1]
+], dtype=np.int64)
+UNIT_CUBE_VERTICES.setflags(write=False)
+
+CUBE_FACES = np.array([
+    [0, 1, 2], [0, 2, 3],  # bottom
+    [4, 5, 6], [4, 6, 7],  # top
+    [0, 1, 5], [0, 5, 4],  # front
+    [2, 3, 7], [2, 7, 6],  # back
+    [1, 2, 6], [1, 6, 5],  # right
+    [0, 3, 7], [0, 7, 4]   # left
+], dtype=np.uint32)
+CUBE_FACES.setflags(write=False)
+
+class ParseCache:
+    """Small thread-safe LRU of parse results keyed by file content digest"""
+    
+    def __init__(self, max_entries):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+    
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+            return entry
+    
+    def put(self, key, entry):
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+PARSE_CACHE = ParseCache(app.config['PARSE_CACHE_SIZE'])
+
+def analysis_results_path(timestamp):
+    """Return the path of the gzip-compressed analysis results saved at timestamp"""
+    return f"conversion-logic_{timestamp}.json.gz"
+
+class RecordList:
+    """Analysis records held as NumPy columns, expanded to dicts only while being written
+    
+    Scalar columns repeat the same value for every record. Keeping millions of
+    candidates as columns costs a few bytes each instead of a dict apiece, and
+    dump_json expands them one batch of records at a time.
+    """
+    
+    def __init__(self, **columns):
+        self.columns = columns
+        self._length = next(len(column) for column in columns.values() if isinstance(column, np.ndarray))
+    
+    def __len__(self):
+        return self._length
+    
+    def __iter__(self):
+        return (record for batch in self.batches(RECORD_BATCH) for record in batch)
+    
+    def batches(self, size):
+        """Yield the records as lists of at most size dicts, expanding the columns a slice at a time"""
+        names = list(self.columns)
+        for start in range(0, self._length, size):
+            values = [column[start:start + size].tolist() if isinstance(column, np.ndarray) else repeat(column)
+                      for column in self.columns.values()]
+            yield [dict(zip(names, record)) for record in zip(*values)]
+
+def _write_json(obj, f):
+    """Write obj to f as compact JSON, encoding RecordList records a batch at a time"""
+    if isinstance(obj, RecordList):
+        f.write('[')
+        separator = ''
+        for batch in obj.batches(RECORD_BATCH):
+            f.write(separator + json.dumps(batch, separators=(',', ':'))[1:-1])
+            separator = ','
+        f.write(']')
+    elif isinstance(obj, dict):
+        f.write('{')
+        for index, (key, value) in enumerate(obj.items()):
+            if not isinstance(key, str):
+                raise TypeError(f"keys must be str, not {type(key).__name__}")
+            f.write((',' if index else '') + json.dumps(key) + ':')
+            _write_json(value, f)
+        f.write('}')
+    elif isinstance(obj, (list, tuple)):
+        f.write('[')
+        for index, value in enumerate(obj):
+            if index:
+                f.write(',')
+            _write_json(value, f)
+        f.write(']')
+    else:
+        # Like json.dump without a default, anything else raises TypeError
+        f.write(json.dumps(obj, separators=(',', ':')))
+
+def dump_json(obj, path):
+    """
+    Write obj to path as JSON: gzip-compressed and compact for a .gz path,
+    indented otherwise. Only the .gz results may hold RecordLists, which are
+    streamed into the file instead of being expanded whole.
+    """
+    if path.endswith('.gz'):
+        # Machine-read results: indenting them only adds whitespace to compress
+        with gzip.open(path, 'wt') as f:
+            _write_json(obj, f)
+    else:
+        with open(path, 'w') as f:
+            json.dump(obj, f, indent=2)
+
+@contextmanager
+def map_file(f):
+    """Yield a read-only mmap over the whole of the open file f"""
+    if os.fstat(f.fileno()).st_size == 0:
+        # mmap refuses empty files
+        yield b''
+        return
+    
+    with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as buffer:
+        yield buffer
+
 class CLYParser:
-    def __init__(self, file_path):
+    def __init__(self, file_path, content_digest=None):
         self.file_path = file_path
-        self.vertices = []
-        self.faces = []
+        # Digest of the file's contents, as returned by _save_upload; parse
+        # results are only cached when it is known, so parsing never needs an
+        # extra pass over the file to compute one
+        self.content_digest = content_digest
+        self.vertices, self.faces = self._empty_mesh()
         self.metadata = {}
-        self.binary_data = []
         self.structure_analysis = {}
         self.logger = logger
+        # Per-chunk and per-candidate messages are debug level; checking the
+        # level once lets hot loops skip formatting them entirely
+        self._log_debug = self.logger.isEnabledFor(logging.DEBUG)
+        # Decoded views of the buffer being scanned, and the buffer they were built over
+        self._views_source = None
+        self._views = {}
+        # (vertices, faces, triangles, normals) from the last export
+        self._normals_cache = None
         
     def hex_dump(self, data, length=64):
         """Create a hex dump for debugging"""
-        hex_str = binascii.hexlify(data[:length]).decode('ascii')
-        return ' '.join(hex_str[i:i+2] for i in range(0, len(hex_str), 2))
+        return data[:length].hex(' ')
     
     def analyze_binary_structure(self, data, offset, length=100):
         """Analyze binary data structure for reverse engineering"""
         self.logger.info(f"=== Binary Structure Analysis at offset {offset} ===")
         
+        # The dumps below are only worth building when debug output is enabled
+        if not self._log_debug:
+            return
+        
         # Look for patterns
-        self.logger.info(f"First {length} bytes as hex: {self.hex_dump(data[offset:offset+length])}")
+        self.logger.debug(f"First {length} bytes as hex: {self.hex_dump(data[offset:offset+length])}")
         
         # Try to find ASCII strings
-        ascii_chars = []
-        for i in range(min(length, len(data) - offset)):
-            byte = data[offset + i]
-            if 32 <= byte <= 126:  # Printable ASCII
-                ascii_chars.append(chr(byte))
-            else:
-                ascii_chars.append('.')
+        ascii_chars = bytes(data[offset:offset+length]).translate(ASCII_DOTS).decode('ascii')
         
-        self.logger.info(f"ASCII representation: {''.join(ascii_chars)}")
+        self.logger.debug(f"ASCII representation: {ascii_chars}")
         
         # Look for potential float values (4 bytes)
         if len(data) - offset >= 16:
-            self.logger.info("Potential 4-byte values (as floats):")
+            self.logger.debug("Potential 4-byte values (as floats):")
             for i in range(0, min(16, len(data) - offset), 4):
                 if i + 4 <= len(data) - offset:
                     try:
-                        float_val = struct.unpack('<f', data[offset+i:offset+i+4])[0]
-                        self.logger.info(f"  Offset {offset+i}: {float_val}")
+                        float_val = FLOAT32.unpack_from(data, offset + i)[0]
+                        self.logger.debug(f"  Offset {offset+i}: {float_val}")
                     except:
                         pass
         
         # Look for potential integer values
         if len(data) - offset >= 8:
-            self.logger.info("Potential 4-byte values (as integers):")
+            self.logger.debug("Potential 4-byte values (as integers):")
             for i in range(0, min(16, len(data) - offset), 4):
                 if i + 4 <= len(data) - offset:
                     try:
-                        int_val = struct.unpack('<I', data[offset+i:offset+i+4])[0]
-                        self.logger.info(f"  Offset {offset+i}: {int_val}")
+                        int_val = UINT32.unpack_from(data, offset + i)[0]
+                        self.logger.debug(f"  Offset {offset+i}: {int_val}")
                     except:
                         pass
     
-    def parse_header(self):
-        """Parse the ASCII header of the .cly file"""
+    def parse_header(self, f):
+        """Parse the ASCII header of the .cly file from the open binary file f"""
         self.logger.info("=== Parsing CLY Header ===")
         
-        with open(self.file_path, 'rb') as f:
-            header_lines = []
-            line_count = 0
-            
-            while True:
-                line = f.readline().decode('utf-8', errors='ignore').strip()
-                header_lines.append(line)
-                line_count += 1
-                
-                self.logger.info(f"Header line {line_count}: {line}")
-                
-                if line == 'endHeader':
-                    break
-                if line_count > 100:  # Safety check
-                    self.logger.warning("Header parsing stopped - too many lines")
-                    break
-            
-            # Parse metadata
-            for line in header_lines:
-                if line.startswith('units'):
-                    self.metadata['units'] = line.split()[1]
-                    self.logger.info(f"Units: {self.metadata['units']}")
-                elif line.startswith('modelDimensions'):
-                    parts = line.split()
-                    self.metadata['dimensions'] = [float(parts[1]), float(parts[2]), float(parts[3])]
-                    self.logger.info(f"Model dimensions: {self.metadata['dimensions']}")
-                elif line.startswith('numVoxels'):
-                    self.metadata['numVoxels'] = int(line.split()[1])
-                    self.logger.info(f"Number of voxels: {self.metadata['numVoxels']}")
-                elif line.startswith('numTris'):
-                    self.metadata['numTris'] = int(line.split()[1])
-                    self.logger.info(f"Number of triangles: {self.metadata['numTris']}")
-                elif line.startswith('bitmap'):
-                    parts = line.split()
-                    self.metadata['bitmap'] = [int(parts[1]), int(parts[2])]
-                    self.logger.info(f"Bitmap info: {self.metadata['bitmap']}")
-                elif line.startswith('fileVersion'):
-                    self.metadata['fileVersion'] = int(line.split()[1])
-                    self.logger.info(f"File version: {self.metadata['fileVersion']}")
-            
-            start_pos = f.tell()
-            self.logger.info(f"Header ends at position: {start_pos}")
-            return start_pos
+        header_lines = []
+        line_count = 0
+        
+        while True:
+            line = f.readline().decode('utf-8', errors='ignore').strip()
+            header_lines.append(line)
+            line_count += 1
+            
+            self.logger.info(f"Header line {line_count}: {line}")
+            
+            if line == 'endHeader':
+                break
+            if line_count > 100:  # Safety check
+                self.logger.warning("Header parsing stopped - too many lines")
+                break
+        
+        # Parse metadata, dispatching on each line's first token
+        for line in header_lines:
+            parts = line.split()
+            field = HEADER_FIELDS.get(parts[0]) if parts else None
+            if field:
+                key, label, parse_value = field
+                self.metadata[key] = parse_value(parts[1:])
+                self.logger.info(f"{label}: {self.metadata[key]}")
+        
+        start_pos = f.tell()
+        self.logger.info(f"Header ends at position: {start_pos}")
+        return start_pos
     
     def parse_binary_data(self, binary_data):
         """Parse binary data according to the CLY format specification"""
@@ -143,8 +357,8 @@ class CLYParser:
         start_pos = 202  # This was determined from analysis
         self.logger.info(f"Starting binary parsing at position: {start_pos}")
         
-        # Read the binary data starting from the header position
-        data = binary_data[start_pos:]
+        # View the binary data starting from the header position without copying it
+        data = memoryview(binary_data)[start_pos:]
         self.logger.info(f"Binary data size: {len(data)} bytes")
         
         try:
@@ -168,25 +382,25 @@ class CLYParser:
             self.logger.info("=== Parsing Mesh Chunks ===")
             all_vertices = []
             all_faces = []
+            vertex_offset = 0
             
             for i, piece in enumerate(pieces):
                 self.logger.info(f"Processing piece {i+1}: {piece['name']}")
                 piece_vertices, piece_faces = self._parse_piece_meshes(data, piece)
                 
-                if piece_vertices and piece_faces:
+                if len(piece_vertices) and len(piece_faces):
                     # Adjust face indices to account for previous vertices
-                    vertex_offset = len(all_vertices)
-                    adjusted_faces = [[f[0] + vertex_offset, f[1] + vertex_offset, f[2] + vertex_offset] 
-                                    for f in piece_faces]
-                    
-                    all_vertices.extend(piece_vertices)
-                    all_faces.extend(adjusted_faces)
+                    all_vertices.append(piece_vertices)
+                    all_faces.append(piece_faces + vertex_offset)
+                    vertex_offset += len(piece_vertices)
                     
                     self.logger.info(f"  Added {len(piece_vertices)} vertices and {len(piece_faces)} faces")
             
-            if all_vertices and all_faces:
-                self.logger.info(f"Successfully extracted {len(all_vertices)} total vertices and {len(all_faces)} total faces")
-                return all_vertices, all_faces
+            if all_vertices:
+                vertices = np.concatenate(all_vertices)
+                faces = np.concatenate(all_faces)
+                self.logger.info(f"Successfully extracted {len(vertices)} total vertices and {len(faces)} total faces")
+                return vertices, faces
             else:
                 self.logger.warning("No mesh data found in any pieces")
                 return self.create_placeholder_mesh()
@@ -194,6 +408,37 @@ class CLYParser:
         except Exception as e:
             self.logger.error(f"Error parsing binary data: {e}", exc_info=True)
             return self.create_placeholder_mesh()
+        finally:
+            # Don't keep the buffer alive (or exported) past this parse
+            self._release_views()
+    
+    def _buffer_views(self, data):
+        """Return the cache of decoded views for data, starting a new one for a different buffer"""
+        if self._views_source is not data:
+            self._views_source = data
+            self._views = {}
+        return self._views
+    
+    def _release_views(self):
+        """Drop the cached views and the reference to the buffer they were built over"""
+        self._views_source = None
+        self._views = {}
+    
+    def _views_at_every_byte(self, data):
+        """Return (uint32, float32) views of data read at every byte offset, built once per buffer"""
+        views = self._buffer_views(data)
+        if 'every_byte' not in views:
+            u32 = np.ndarray((max(len(data) - 3, 0),), dtype='<u4', buffer=data, strides=(1,))
+            views['every_byte'] = (u32, u32.view('<f4'))
+        return views['every_byte']
+    
+    def _aligned_words(self, data):
+        """Return (uint32, float32) views of data's 4-byte aligned words, built once per buffer"""
+        views = self._buffer_views(data)
+        if 'aligned' not in views:
+            u32 = np.frombuffer(data, dtype='<u4', count=len(data) // 4)
+            views['aligned'] = (u32, u32.view('<f4'))
+        return views['aligned']
     
     def _parse_freestyle_header(self, data):
         """Parse the FreeStyle file header based on analysis results"""
@@ -203,10 +448,8 @@ class CLYParser:
         
         try:
             # Look for "form" magic number (666f726d) instead of "CLYF"
-            magic_pos = data.find(b'form')
-            if magic_pos == -1:
-                # Try hex representation
-                magic_pos = data.find(b'\x66\x6f\x72\x6d')
+            match = FORM_MAGIC_RE.search(data)
+            magic_pos = match.start() if match else -1
             
             if magic_pos == -1:
                 self.logger.warning("FreeStyle 'form' magic number not found, trying alternative parsing")
@@ -214,7 +457,7 @@ class CLYParser:
                 magic_pos = 0
             
             pos = magic_pos
-            magic = data[pos:pos+4]
+            magic = bytes(data[pos:pos+4])
             self.logger.info(f"Found magic: {magic}")
             
             pos += 4
@@ -228,7 +471,7 @@ class CLYParser:
             # Look for potential version field (4 bytes after magic)
             if pos + 4 <= len(data):
                 try:
-                    version = struct.unpack('<I', data[pos:pos+4])[0]
+                    version = UINT32.unpack_from(data, pos)[0]
                     self.logger.info(f"Version field: {version}")
                     pos += 4
                 except:
@@ -237,7 +480,7 @@ class CLYParser:
             # Look for flags field
             if pos + 4 <= len(data):
                 try:
-                    flags = struct.unpack('<I', data[pos:pos+4])[0]
+                    flags = UINT32.unpack_from(data, pos)[0]
                     self.logger.info(f"Flags field: {flags}")
                     pos += 4
                 except:
@@ -246,7 +489,7 @@ class CLYParser:
             # Look for piece count
             if pos + 4 <= len(data):
                 try:
-                    piece_count = struct.unpack('<I', data[pos:pos+4])[0]
+                    piece_count = UINT32.unpack_from(data, pos)[0]
                     self.logger.info(f"Piece count: {piece_count}")
                     pos += 4
                 except:
@@ -263,6 +506,16 @@ class CLYParser:
             self.logger.error(f"Error parsing FreeStyle header: {e}")
             return None
     
+    def _iter_piece_name_candidates(self, data, pos, scan_end):
+        """Yield (offset, name) for readable null-terminated strings starting before scan_end"""
+        for match in PIECE_NAME_RE.finditer(data, pos, min(scan_end + 64, len(data))):
+            if match.start() >= scan_end:
+                return
+            
+            name = match.group().decode('ascii').strip()
+            if len(name) > 3 and not name.startswith('.'):
+                yield match.start(), name
+    
     def _parse_piece_directory(self, data, header_size):
         """Parse the piece directory based on FreeStyle format analysis"""
         pieces = []
@@ -274,26 +527,10 @@ class CLYParser:
         # The analysis showed potential offsets at positions 100, 160, 188, 200
         potential_offsets = [100, 160, 188, 200]
         
-        # Also look for ASCII strings that might be piece names
-        piece_candidates = []
-        
-        # Search for readable strings that could be piece names
-        for i in range(pos, min(pos + 50000, len(data) - 64)):
-            if data[i] == 0:  # Null terminator
-                continue
-            
-            # Try to read a potential piece name
-            name_bytes = data[i:i+64]
-            null_pos = name_bytes.find(b'\x00')
-            if null_pos != -1:
-                name_bytes = name_bytes[:null_pos]
-            
-            try:
-                name = name_bytes.decode('ascii', errors='ignore').strip()
-                if len(name) > 3 and name.isprintable() and not name.startswith('.'):
-                    piece_candidates.append((i, name))
-            except:
-                continue
+        # Also look for ASCII strings that might be piece names; only the
+        # first 20 are ever used, so stop scanning once we have them
+        scan_end = min(pos + 50000, len(data) - 64)
+        piece_candidates = list(islice(self._iter_piece_name_candidates(data, pos, scan_end), 20))
         
         self.logger.info(f"Found {len(piece_candidates)} potential piece names")
         
@@ -305,7 +542,7 @@ class CLYParser:
             if offset < len(data) - 64:
                 try:
                     # Try to read a piece name at this offset
-                    name_bytes = data[offset:offset+64]
+                    name_bytes = bytes(data[offset:offset+64])
                     null_pos = name_bytes.find(b'\x00')
                     if null_pos != -1:
                         name_bytes = name_bytes[:null_pos]
@@ -319,12 +556,13 @@ class CLYParser:
                             'chunkOffsets': []
                         })
                         used_offsets.add(offset)
-                        self.logger.info(f"  Analysis piece at offset {offset}: '{name}'")
+                        if self._log_debug:
+                            self.logger.debug(f"  Analysis piece at offset {offset}: '{name}'")
                 except:
                     pass
         
-        # Then add some of the string candidates
-        for i, (offset, name) in enumerate(piece_candidates[:20]):  # Limit to 20 pieces
+        # Then add the string candidates
+        for i, (offset, name) in enumerate(piece_candidates):
             if offset not in used_offsets:
                 # Try to read chunk count and offsets
                 chunk_count = 0
@@ -334,14 +572,12 @@ class CLYParser:
                 chunk_pos = offset + 64
                 if chunk_pos + 4 <= len(data):
                     try:
-                        chunk_count = struct.unpack('<I', data[chunk_pos:chunk_pos+4])[0]
+                        chunk_count = UINT32.unpack_from(data, chunk_pos)[0]
                         if chunk_count > 0 and chunk_count < 1000:  # Reasonable range
                             chunk_pos += 4
-                            for j in range(chunk_count):
-                                if chunk_pos + 4 <= len(data):
-                                    chunk_offset = struct.unpack('<I', data[chunk_pos:chunk_pos+4])[0]
-                                    chunk_offsets.append(chunk_offset)
-                                    chunk_pos += 4
+                            # Read the whole offset table (truncated at end of data) in one call
+                            available = min(chunk_count, (len(data) - chunk_pos) // 4)
+                            chunk_offsets = np.frombuffer(data, dtype='<u4', count=available, offset=chunk_pos).tolist()
                     except:
                         pass
                 
@@ -352,31 +588,26 @@ class CLYParser:
                     'chunkOffsets': chunk_offsets
                 })
                 
-                self.logger.info(f"  String piece {len(pieces)}: '{name}' with {chunk_count} chunks")
+                if self._log_debug:
+                    self.logger.debug(f"  String piece {len(pieces)}: '{name}' with {chunk_count} chunks")
         
         # If we still don't have enough pieces, create some based on data patterns
         if len(pieces) < 5:
             self.logger.info("Creating additional pieces based on data patterns...")
             
             # Look for potential mesh data by scanning for vertex-like patterns
+            # View the data as a float starting at every byte offset, so each
+            # region's candidate vertices can be range-checked in one pass
+            byte_floats = self._views_at_every_byte(data)[1]
             for i in range(0, len(data) - 1000, 1000):
                 if i in used_offsets:
                     continue
                 
                 # Check if this region looks like it contains mesh data
                 # Look for sequences of floats that could be vertices
-                float_count = 0
-                for j in range(i, min(i + 100, len(data) - 12)):
-                    try:
-                        x = struct.unpack('<f', data[j:j+4])[0]
-                        y = struct.unpack('<f', data[j+4:j+8])[0]
-                        z = struct.unpack('<f', data[j+8:j+12])[0]
-                        
-                        # Check if these look like reasonable vertex coordinates
-                        if -10000 < x < 10000 and -10000 < y < 10000 and -10000 < z < 10000:
-                            float_count += 1
-                    except:
-                        pass
+                window = byte_floats[i:min(i + 100, len(data) - 12) + 8]
+                plausible = (window > -10000) & (window < 10000)
+                float_count = int(np.count_nonzero(plausible[:-8] & plausible[4:-4] & plausible[8:]))
                 
                 if float_count > 10:  # Found a reasonable number of vertex-like floats
                     pieces.append({
@@ -386,7 +617,8 @@ class CLYParser:
                         'chunkOffsets': [i]
                     })
                     used_offsets.add(i)
-                    self.logger.info(f"  Created mesh piece at offset {i} with {float_count} potential vertices")
+                    if self._log_debug:
+                        self.logger.debug(f"  Created mesh piece at offset {i} with {float_count} potential vertices")
                 
                 if len(pieces) >= 10:  # Limit total pieces
                     break
@@ -396,8 +628,8 @@ class CLYParser:
     
     def _parse_piece_meshes(self, data, piece):
         """Parse mesh chunks from a piece using improved FreeStyle format handling"""
-        vertices = []
-        faces = []
+        vertex_blocks = []
+        face_blocks = []
         
         self.logger.info(f"=== Parsing meshes for piece: {piece['name']} ===")
         
@@ -409,170 +641,153 @@ class CLYParser:
                     
                 try:
                     # Read chunk header
-                    chunk_type = struct.unpack('<I', data[chunk_offset:chunk_offset+4])[0]
-                    chunk_size = struct.unpack('<I', data[chunk_offset+4:chunk_offset+8])[0]
+                    chunk_type, chunk_size = CHUNK_HEADER.unpack_from(data, chunk_offset)
                     
-                    self.logger.info(f"    Chunk type: {chunk_type}, size: {chunk_size}")
+                    if self._log_debug:
+                        self.logger.debug(f"    Chunk type: {chunk_type}, size: {chunk_size}")
                     
                     # Check if this is a mesh chunk (type 1) or try to parse as mesh data
                     if (chunk_type == 1 or chunk_type == 0) and chunk_size > 0:
                         payload_start = chunk_offset + 8
                         if payload_start + chunk_size <= len(data):
-                            payload = data[payload_start:payload_start + chunk_size]
+                            # Zero-copy window onto the chunk; _parse_mesh_chunk only unpacks from it
+                            payload = memoryview(data)[payload_start:payload_start + chunk_size]
                             chunk_vertices, chunk_faces = self._parse_mesh_chunk(payload)
                             
-                            if chunk_vertices and chunk_faces:
-                                vertices.extend(chunk_vertices)
-                                faces.extend(chunk_faces)
-                                self.logger.info(f"      Extracted {len(chunk_vertices)} vertices and {len(chunk_faces)} faces")
+                            if len(chunk_vertices) and len(chunk_faces):
+                                vertex_blocks.append(chunk_vertices)
+                                face_blocks.append(chunk_faces)
+                                if self._log_debug:
+                                    self.logger.debug(f"      Extracted {len(chunk_vertices)} vertices and {len(chunk_faces)} faces")
                     
                 except Exception as e:
                     self.logger.warning(f"Error parsing chunk at offset {chunk_offset}: {e}")
                     continue
         
         # If no chunks found or no valid mesh data, try direct parsing from piece offset
-        if not vertices and not faces:
+        if not vertex_blocks:
             self.logger.info(f"  No valid chunks found, trying direct parsing from offset {piece['offset']}")
             
             # Try to parse mesh data directly from the piece offset
             start_offset = piece['offset']
             
-            # Look for vertex data patterns
-            for offset in range(start_offset, min(start_offset + 10000, len(data) - 100)):
-                try:
-                    # Try to read vertex count
-                    vertex_count = struct.unpack('<I', data[offset:offset+4])[0]
-                    
-                    # Sanity check
-                    if vertex_count > 0 and vertex_count < 100000:
-                        # Calculate expected data size
-                        vertex_data_size = vertex_count * 3 * 4  # 3 floats per vertex
-                        total_expected_size = 4 + vertex_data_size + 4  # count + vertices + triangle count
-                        
-                        if offset + total_expected_size <= len(data):
-                            # Try to read vertices
-                            pos = offset + 4
-                            piece_vertices = []
-                            
-                            for i in range(vertex_count):
-                                if pos + 12 <= len(data):
-                                    x = struct.unpack('<f', data[pos:pos+4])[0]
-                                    y = struct.unpack('<f', data[pos+4:pos+8])[0]
-                                    z = struct.unpack('<f', data[pos+8:pos+12])[0]
-                                    
-                                    # Sanity check for vertex coordinates
-                                    if -10000 < x < 10000 and -10000 < y < 10000 and -10000 < z < 10000:
-                                        piece_vertices.append([x, y, z])
-                                    else:
-                                        break  # Invalid vertex data
-                                    
-                                    pos += 12
-                                else:
-                                    break
-                            
-                            # If we found valid vertices, try to read triangles
-                            if len(piece_vertices) == vertex_count:
-                                if pos + 4 <= len(data):
-                                    tri_count = struct.unpack('<I', data[pos:pos+4])[0]
-                                    pos += 4
-                                    
-                                    if tri_count > 0 and tri_count < 100000:
-                                        piece_faces = []
-                                        
-                                        for i in range(tri_count):
-                                            if pos + 12 <= len(data):
-                                                i1 = struct.unpack('<I', data[pos:pos+4])[0]
-                                                i2 = struct.unpack('<I', data[pos+4:pos+8])[0]
-                                                i3 = struct.unpack('<I', data[pos+8:pos+12])[0]
-                                                
-                                                # Validate indices
-                                                if i1 < vertex_count and i2 < vertex_count and i3 < vertex_count:
-                                                    piece_faces.append([i1, i2, i3])
-                                                else:
-                                                    break  # Invalid face indices
-                                                
-                                                pos += 12
-                                            else:
-                                                break
-                                        
-                                        if len(piece_faces) == tri_count:
-                                            vertices.extend(piece_vertices)
-                                            faces.extend(piece_faces)
-                                            self.logger.info(f"      Direct parsing: {len(piece_vertices)} vertices, {len(piece_faces)} faces")
-                                            break  # Success, stop searching
+            end_offset = min(start_offset + 10000, len(data) - 100)
+            
+            # Look for vertex data patterns: read the candidate vertex count at
+            # every byte offset at once and only try the plausible ones
+            if end_offset > start_offset:
+                counts = self._views_at_every_byte(data)[0][start_offset:end_offset]
+                candidates = start_offset + np.flatnonzero((counts > 0) & (counts < 100000))
                 
-                except Exception as e:
-                    continue  # Try next offset
+                for offset in candidates.tolist():
+                    mesh = self._try_parse_mesh(data, offset)
+                    if mesh is not None:
+                        piece_vertices, piece_faces = mesh
+                        vertex_blocks.append(piece_vertices)
+                        face_blocks.append(piece_faces)
+                        self.logger.info(f"      Direct parsing: {len(piece_vertices)} vertices, {len(piece_faces)} faces")
+                        break  # Success, stop searching
+        
+        if not vertex_blocks:
+            return self._empty_mesh()
+        return np.concatenate(vertex_blocks), np.concatenate(face_blocks)
+    
+    def _try_parse_mesh(self, data, offset):
+        """Read a vertex-count-prefixed vertex block and triangle block at offset, or return None"""
+        vertex_count = UINT32.unpack_from(data, offset)[0]
+        
+        # Calculate expected data size
+        vertex_data_size = vertex_count * 3 * 4  # 3 floats per vertex
+        total_expected_size = 4 + vertex_data_size + 4  # count + vertices + triangle count
+        if offset + total_expected_size > len(data):
+            return None
+        
+        # Read vertices and sanity check their coordinates
+        pos = offset + 4
+        vertices = np.frombuffer(data, dtype='<f4', count=vertex_count * 3, offset=pos).reshape(-1, 3)
+        if not (np.abs(vertices) < 10000).all():
+            return None
+        pos += vertex_data_size
+        
+        # Read triangles and validate their indices
+        tri_count = UINT32.unpack_from(data, pos)[0]
+        pos += 4
+        if not (0 < tri_count < 100000) or pos + tri_count * 12 > len(data):
+            return None
+        
+        faces = np.frombuffer(data, dtype='<u4', count=tri_count * 3, offset=pos).reshape(-1, 3)
+        if not (faces < vertex_count).all():
+            return None
         
         return vertices, faces
     
+    def _plausible_vertices(self, records, limit):
+        """Return a mask of the (N, 3) float rows whose coordinates all lie strictly within +/-limit"""
+        # One abs-and-compare pass; NaN compares false, so NaN and infinity fail too
+        return (np.abs(records) < limit).all(axis=1)
+    
+    def _empty_mesh(self):
+        """Return an empty mesh in the (float32 vertices, uint32 faces) layout"""
+        return np.empty((0, 3), dtype=np.float32), np.empty((0, 3), dtype=np.uint32)
+    
     def _parse_mesh_chunk(self, payload):
-        """Parse a mesh chunk payload"""
+        """Parse a mesh chunk payload into float32 vertex and uint32 face arrays"""
         if len(payload) < 8:
-            return [], []
+            return self._empty_mesh()
         
         try:
             pos = 0
             
             # Read vertex count
-            vertex_count = struct.unpack('<I', payload[pos:pos+4])[0]
+            vertex_count = UINT32.unpack_from(payload, pos)[0]
             pos += 4
             
             if vertex_count > 1000000:  # Sanity check
                 self.logger.warning(f"Unreasonable vertex count: {vertex_count}")
-                return [], []
+                return self._empty_mesh()
             
             # Read vertices
             vertex_data_size = vertex_count * 3 * 4  # 3 floats per vertex
             if pos + vertex_data_size > len(payload):
                 self.logger.warning("Not enough data for vertices")
-                return [], []
+                return self._empty_mesh()
             
-            vertices = []
-            for i in range(vertex_count):
-                x = struct.unpack('<f', payload[pos:pos+4])[0]
-                y = struct.unpack('<f', payload[pos+4:pos+8])[0]
-                z = struct.unpack('<f', payload[pos+8:pos+12])[0]
-                vertices.append([x, y, z])
-                pos += 12
+            vertices = np.frombuffer(payload, dtype='<f4', count=vertex_count * 3, offset=pos).reshape(-1, 3)
+            pos += vertex_data_size
             
             # Read triangle count
             if pos + 4 > len(payload):
                 self.logger.warning("Not enough data for triangle count")
-                return vertices, []
+                return vertices, np.empty((0, 3), dtype=np.uint32)
             
-            tri_count = struct.unpack('<I', payload[pos:pos+4])[0]
+            tri_count = UINT32.unpack_from(payload, pos)[0]
             pos += 4
             
             if tri_count > 1000000:  # Sanity check
                 self.logger.warning(f"Unreasonable triangle count: {tri_count}")
-                return vertices, []
+                return vertices, np.empty((0, 3), dtype=np.uint32)
             
             # Read triangle indices
             face_data_size = tri_count * 3 * 4  # 3 uint32 per triangle
             if pos + face_data_size > len(payload):
                 self.logger.warning("Not enough data for faces")
-                return vertices, []
+                return vertices, np.empty((0, 3), dtype=np.uint32)
             
-            faces = []
-            for i in range(tri_count):
-                i1 = struct.unpack('<I', payload[pos:pos+4])[0]
-                i2 = struct.unpack('<I', payload[pos+4:pos+8])[0]
-                i3 = struct.unpack('<I', payload[pos+8:pos+12])[0]
-                
-                # Validate indices
-                if i1 < vertex_count and i2 < vertex_count and i3 < vertex_count:
-                    faces.append([i1, i2, i3])
-                else:
+            faces = np.frombuffer(payload, dtype='<u4', count=tri_count * 3, offset=pos).reshape(-1, 3)
+            
+            # Validate indices
+            # The common all-valid case keeps the zero-copy view
+            valid = (faces < vertex_count).all(axis=1)
+            if not valid.all():
+                for i1, i2, i3 in faces[~valid].tolist():
                     self.logger.warning(f"Invalid face indices: {i1}, {i2}, {i3} (max: {vertex_count})")
-                
-                pos += 12
+                faces = faces[valid]
             
             return vertices, faces
             
         except Exception as e:
             self.logger.error(f"Error parsing mesh chunk: {e}")
-            return [], []
+            return self._empty_mesh()
     
     def create_placeholder_mesh(self):
         """Create a placeholder mesh based on metadata"""
@@ -583,79 +798,70 @@ class CLYParser:
             dims = self.metadata['dimensions']
             self.logger.info(f"Creating placeholder mesh with dimensions: {dims}")
             
-            # Create a simple box with the given dimensions
-            x, y, z = dims[0], dims[1], dims[2]
+            # Create a simple box with the given dimensions by scaling the shared unit cube;
+            # adding 0.0 turns the -0.0 from scaling a negative dimension back into 0.0
+            vertices = UNIT_CUBE_VERTICES * np.asarray(dims[:3], dtype=np.float64) + 0.0
             
-            vertices = np.array([
-                [0, 0, 0], [x, 0, 0], [x, y, 0], [0, y, 0],
-                [0, 0, z], [x, 0, z], [x, y, z], [0, y, z]
-            ])
-            
-            faces = np.array([
-                [0, 1, 2], [0, 2, 3],  # bottom
-                [4, 5, 6], [4, 6, 7],  # top
-                [0, 1, 5], [0, 5, 4],  # front
-                [2, 3, 7], [2, 7, 6],  # back
-                [1, 2, 6], [1, 6, 5],  # right
-                [0, 3, 7], [0, 7, 4]   # left
-            ])
-            
-            self.logger.info(f"Created placeholder mesh with {len(vertices)} vertices and {len(faces)} faces")
-            return vertices, faces
+            self.logger.info(f"Created placeholder mesh with {len(vertices)} vertices and {len(CUBE_FACES)} faces")
+            return vertices, CUBE_FACES
         else:
             # Fallback to unit cube
             self.logger.warning("No dimensions found, creating unit cube")
-            vertices = np.array([
-                [0, 0, 0], [1, 0, 0], [1, 1, 0], [0, 1, 0],
-                [0, 0, 1], [1, 0, 1], [1, 1, 1], [0, 1, 1]
-            ])
-            
-            faces = np.array([
-                [0, 1, 2], [0, 2, 3],  # bottom
-                [4, 5, 6], [4, 6, 7],  # top
-                [0, 1, 5], [0, 5, 4],  # front
-                [2, 3, 7], [2, 7, 6],  # back
-                [1, 2, 6], [1, 6, 5],  # right
-                [0, 3, 7], [0, 7, 4]   # left
-            ])
-            
-            return vertices, faces
+            return UNIT_CUBE_VERTICES, CUBE_FACES
+    
+    def _extract_mesh(self, data):
+        """Run the mesh extraction strategies over the mapped file data"""
+        # Try the enhanced mesh extraction first (uses analysis insights)
+        self.logger.info("=== Trying Enhanced Mesh Extraction ===")
+        enhanced_vertices, enhanced_faces = self.enhanced_mesh_extraction(data)
+        
+        if len(enhanced_vertices) and len(enhanced_faces):
+            self.vertices = enhanced_vertices
+            self.faces = enhanced_faces
+            self.logger.info("Successfully parsed using enhanced extraction")
+        else:
+            # Try the new FreeStyle format parsing
+            self.logger.info("=== Trying FreeStyle Format Parsing ===")
+            freestyle_vertices, freestyle_faces = self.parse_freestyle_format(data)
+            
+            if len(freestyle_vertices) and len(freestyle_faces):
+                self.vertices = freestyle_vertices
+                self.faces = freestyle_faces
+                self.logger.info("Successfully parsed using FreeStyle format")
+            else:
+                # Fall back to the original parsing method
+                self.logger.info("=== Falling back to original parsing method ===")
+                self.vertices, self.faces = self.parse_binary_data(data)
     
     def parse(self):
         """Parse the entire .cly file with comprehensive logging"""
         self.logger.info("=== Starting CLY File Parsing ===")
         self.logger.info(f"File: {self.file_path}")
-        self.logger.info(f"File size: {os.path.getsize(self.file_path)} bytes")
         
         try:
-            # First parse the ASCII header to get metadata
-            start_pos = self.parse_header()
-            
-            # Read the entire file for binary parsing
-            with open(self.file_path, 'rb') as f:
-                self.binary_data = f.read()
-            
-            # Try the enhanced mesh extraction first (uses analysis insights)
-            self.logger.info("=== Trying Enhanced Mesh Extraction ===")
-            enhanced_vertices, enhanced_faces = self.enhanced_mesh_extraction(self.binary_data)
-            
-            if enhanced_vertices and enhanced_faces:
-                self.vertices = enhanced_vertices
-                self.faces = enhanced_faces
-                self.logger.info("Successfully parsed using enhanced extraction")
-            else:
-                # Try the new FreeStyle format parsing
-                self.logger.info("=== Trying FreeStyle Format Parsing ===")
-                freestyle_vertices, freestyle_faces = self.parse_freestyle_format(self.binary_data)
+            # Open the file once: the header is read line by line from the
+            # buffered file, the binary parsers work on a read-only mapping
+            with open(self.file_path, 'rb') as f, map_file(f) as data:
+                self.logger.info(f"File size: {len(data)} bytes")
                 
-                if freestyle_vertices and freestyle_faces:
-                    self.vertices = freestyle_vertices
-                    self.faces = freestyle_faces
-                    self.logger.info("Successfully parsed using FreeStyle format")
+                # Identical contents (e.g. a re-submitted upload) reuse the earlier result
+                cache_key = self.content_digest
+                cached = PARSE_CACHE.get(cache_key) if cache_key is not None else None
+                if cached is not None:
+                    self.logger.info(f"Reusing cached parse result {cache_key}")
+                    metadata, self.vertices, self.faces = cached
+                    self.metadata = dict(metadata)
                 else:
-                    # Fall back to the original parsing method
-                    self.logger.info("=== Falling back to original parsing method ===")
-                    self.vertices, self.faces = self.parse_binary_data(self.binary_data)
+                    # First parse the ASCII header to get metadata
+                    self.parse_header(f)
+                    self._extract_mesh(data)
+                    # Cached arrays are shared by every later parse of the same
+                    # contents, so none of them may modify the mesh in place
+                    if cache_key is not None:
+                        for array in (self.vertices, self.faces):
+                            if isinstance(array, np.ndarray):
+                                array.setflags(write=False)
+                        PARSE_CACHE.put(cache_key, (dict(self.metadata), self.vertices, self.faces))
             
             self.logger.info("=== Parsing Summary ===")
             self.logger.info(f"Metadata: {self.metadata}")
@@ -667,68 +873,70 @@ class CLYParser:
             self.logger.error(f"Error parsing .cly file: {e}", exc_info=True)
             return False
     
+    def _triangle_normals(self):
+        """Return the (N, 3, 3) face triangles and their (N, 3) unit normals"""
+        # Normals depend only on the geometry, so re-exporting the same mesh
+        # (e.g. in the other STL format) reuses them; reassigning either
+        # self.vertices or self.faces invalidates the cache
+        cache = self._normals_cache
+        if cache is not None and cache[0] is self.vertices and cache[1] is self.faces:
+            return cache[2], cache[3]
+        
+        # Work in the mesh's own precision: parsed meshes are float32, the
+        # placeholder boxes float64 (or integer for the unit cube) so their
+        # ASCII coordinates print exactly; the binary writer narrows to float32
+        vertices = np.asarray(self.vertices).reshape(-1, 3)
+        faces = np.asarray(self.faces, dtype=np.uint32).reshape(-1, 3)
+        
+        # Gather every triangle at once and cross its two edges in one pass
+        triangles = vertices[faces]
+        normals = np.cross(triangles[:, 1] - triangles[:, 0], triangles[:, 2] - triangles[:, 0])
+        if normals.dtype.kind != 'f':
+            normals = normals.astype(np.float64)
+        
+        # Squared lengths in one fused pass, square-rooted in place; degenerate
+        # (zero-area) triangles get a zero normal rather than NaN
+        lengths = np.einsum('ij,ij->i', normals, normals)
+        np.sqrt(lengths, out=lengths)
+        lengths = lengths[:, None]
+        normals = np.divide(normals, lengths, out=np.zeros_like(normals), where=lengths > 0)
+        
+        self._normals_cache = (self.vertices, self.faces, triangles, normals)
+        return triangles, normals
+    
     def export_stl(self, output_path, ascii_format=True):
         """Export to STL format with logging"""
         self.logger.info(f"=== Exporting to STL ===")
         self.logger.info(f"Output path: {output_path}")
         self.logger.info(f"Format: {'ASCII' if ascii_format else 'Binary'}")
         
+        triangles, normals = self._triangle_normals()
+        
         if ascii_format:
-            with open(output_path, 'w') as f:
+            with open(output_path, 'w', buffering=STL_WRITE_BUFFER) as f:
                 f.write("solid mesh\n")
-                for i, face in enumerate(self.faces):
-                    # Get the three vertices for this face
-                    v1_idx, v2_idx, v3_idx = face
-                    v1 = self.vertices[v1_idx]
-                    v2 = self.vertices[v2_idx]
-                    v3 = self.vertices[v3_idx]
-                    
-                    # Calculate normal
-                    normal = np.cross(np.array(v2) - np.array(v1), np.array(v3) - np.array(v1))
-                    normal = normal / np.linalg.norm(normal)
-                    
-                    f.write(f"  facet normal {normal[0]:.6f} {normal[1]:.6f} {normal[2]:.6f}\n")
-                    f.write("    outer loop\n")
-                    f.write(f"      vertex {v1[0]:.6f} {v1[1]:.6f} {v1[2]:.6f}\n")
-                    f.write(f"      vertex {v2[0]:.6f} {v2[1]:.6f} {v2[2]:.6f}\n")
-                    f.write(f"      vertex {v3[0]:.6f} {v3[1]:.6f} {v3[2]:.6f}\n")
-                    f.write("    endloop\n")
-                    f.write("  endfacet\n")
+                # One row of 12 coordinates per facet, formatted by a single template
+                rows = np.concatenate([normals, triangles.reshape(-1, 9)], axis=1).tolist()
+                f.writelines(ASCII_FACET % tuple(row) for row in rows)
                 f.write("endsolid mesh\n")
         else:
             # Binary STL
-            with open(output_path, 'wb') as f:
+            with open(output_path, 'wb', buffering=STL_WRITE_BUFFER) as f:
                 # Write header (80 bytes)
                 f.write(b'\x00' * 80)
                 
                 # Write number of triangles
-                f.write(struct.pack('<I', len(self.faces)))
+                f.write(UINT32.pack(len(self.faces)))
                 
-                # Write each triangle
-                for i, face in enumerate(self.faces):
-                    # Get the three vertices for this face
-                    v1_idx, v2_idx, v3_idx = face
-                    v1 = self.vertices[v1_idx]
-                    v2 = self.vertices[v2_idx]
-                    v3 = self.vertices[v3_idx]
-                    
-                    # Calculate normal
-                    normal = np.cross(np.array(v2) - np.array(v1), np.array(v3) - np.array(v1))
-                    normal = normal / np.linalg.norm(normal)
-                    
-                    # Write normal
-                    f.write(struct.pack('<3f', normal[0], normal[1], normal[2]))
-                    
-                    # Write vertices
-                    f.write(struct.pack('<3f', v1[0], v1[1], v1[2]))
-                    f.write(struct.pack('<3f', v2[0], v2[1], v2[2]))
-                    f.write(struct.pack('<3f', v3[0], v3[1], v3[2]))
-                    
-                    # Write attribute byte count (0)
-                    f.write(struct.pack('<H', 0))
+                # Write every triangle as one block of facet records
+                facets = np.empty(len(triangles), dtype=STL_FACET)
+                facets['normal'] = normals
+                facets['vertices'] = triangles
+                facets['attribute'] = 0
+                facets.tofile(f)
         
         self.logger.info(f"STL export completed: {len(self.faces)} faces written")
-
+    
     def extract_real_mesh(self, data, start_pos):
         """Attempt to extract real mesh data from binary data"""
         self.logger.info("=== Attempting Real Mesh Extraction ===")
@@ -741,93 +949,75 @@ class CLYParser:
         
         # Strategy 1: Look for large blocks of vertex data
         # Most 3D formats store vertices as consecutive float triplets
-        vertices = []
-        faces = []
+        vertices, faces = self._empty_mesh()
         
         # Search for vertex data patterns
         self.logger.info("=== Searching for vertex data ===")
         
-        # Look for areas with high density of reasonable float values
-        vertex_candidates = []
-        for i in range(0, min(len(data), 100000), 12):  # Check more data
-            if i + 12 <= len(data):
-                try:
-                    x, y, z = struct.unpack('<fff', data[i:i+12])
-                    # More strict validation for actual vertex data
-                    if all(-1000 < val < 1000 for val in [x, y, z]) and \
-                       not any(np.isnan(val) for val in [x, y, z]) and \
-                       not any(np.isinf(val) for val in [x, y, z]):
-                        vertex_candidates.append((i, x, y, z))
-                except:
-                    pass
+        # Look for areas with high density of reasonable float values: view the
+        # first 100KB as float triplets and range-check them all at once
+        # (the range check also rejects NaN and infinity)
+        record_count = min(len(data) // 12, (100000 + 11) // 12)
+        records = np.frombuffer(data, dtype='<f4', count=record_count * 3).reshape(-1, 3)
+        valid = self._plausible_vertices(records, 1000)
+        candidate_offsets = np.flatnonzero(valid) * 12
+        candidate_vertices = records[valid]
         
-        self.logger.info(f"Found {len(vertex_candidates)} vertex candidates")
+        self.logger.info(f"Found {len(candidate_offsets)} vertex candidates")
         
         # Look for clusters of vertex data
-        if len(vertex_candidates) > 100:
-            # Group vertices by proximity in file
-            vertex_clusters = []
-            current_cluster = []
-            
-            for i, (offset, x, y, z) in enumerate(vertex_candidates):
-                if not current_cluster or offset - current_cluster[-1][0] <= 1000:
-                    current_cluster.append((offset, x, y, z))
-                else:
-                    if len(current_cluster) > 10:  # Minimum cluster size
-                        vertex_clusters.append(current_cluster)
-                    current_cluster = [(offset, x, y, z)]
-            
-            if current_cluster and len(current_cluster) > 10:
-                vertex_clusters.append(current_cluster)
+        if len(candidate_offsets) > 100:
+            # Group vertices by proximity in file: a new cluster starts
+            # wherever the gap to the previous candidate exceeds 1000 bytes
+            splits = np.flatnonzero(np.diff(candidate_offsets) > 1000) + 1
+            vertex_clusters = [
+                (offsets, cluster_vertices)
+                for offsets, cluster_vertices in zip(np.split(candidate_offsets, splits),
+                                                     np.split(candidate_vertices, splits))
+                if len(offsets) > 10  # Minimum cluster size
+            ]
             
             self.logger.info(f"Found {len(vertex_clusters)} vertex clusters")
             
             # Use the largest cluster as our vertex data
             if vertex_clusters:
-                largest_cluster = max(vertex_clusters, key=len)
-                self.logger.info(f"Using largest cluster with {len(largest_cluster)} vertices")
+                cluster_offsets, cluster_vertices = max(vertex_clusters, key=lambda cluster: len(cluster[0]))
+                self.logger.info(f"Using largest cluster with {len(cluster_offsets)} vertices")
                 
-                # Extract vertices from the cluster
-                for offset, x, y, z in largest_cluster:
-                    vertices.append([x, y, z])
+                # Extract vertices from the cluster (copied out of the mapped data)
+                vertices = cluster_vertices.copy()
                 
                 # Now look for face data near the vertex data
                 self.logger.info("=== Searching for face data ===")
                 
                 # Look for face indices after the vertex data
-                vertex_start = largest_cluster[0][0]
-                vertex_end = largest_cluster[-1][0] + 12
+                vertex_start = int(cluster_offsets[0])
+                vertex_end = int(cluster_offsets[-1]) + 12
                 
-                # Search for face data after vertex data
-                face_candidates = []
-                for i in range(vertex_end, min(len(data), vertex_end + 100000), 12):
-                    if i + 12 <= len(data):
-                        try:
-                            v1, v2, v3 = struct.unpack('<III', data[i:i+12])
-                            # Check if these indices are valid for our vertex count
-                            if 0 <= v1 < len(vertices) and 0 <= v2 < len(vertices) and 0 <= v3 < len(vertices):
-                                face_candidates.append((i, v1, v2, v3))
-                        except:
-                            pass
+                # Search for face data after vertex data: index triplets that
+                # are all valid for our vertex count
+                record_count = min((len(data) - vertex_end) // 12, (100000 + 11) // 12)
+                index_records = np.frombuffer(data, dtype='<u4', count=record_count * 3,
+                                              offset=vertex_end).reshape(-1, 3)
+                face_candidates = index_records[(index_records < len(vertices)).all(axis=1)]
             
             self.logger.info(f"Found {len(face_candidates)} face candidates")
             
             # Use face candidates if we have enough
             if len(face_candidates) > 100:
-                for offset, v1, v2, v3 in face_candidates[:expected_tris]:
-                    faces.append([v1, v2, v3])
+                faces = face_candidates[:expected_tris]
                 self.logger.info(f"Using {len(faces)} faces")
         
         # If we found real data, use it
         if len(vertices) > 100 and len(faces) > 100:
             self.logger.info(f"Successfully extracted {len(vertices)} vertices and {len(faces)} faces")
-            self.vertices = np.array(vertices)
-            self.faces = np.array(faces)
+            self.vertices = vertices
+            self.faces = faces
             return True
         else:
             self.logger.warning("Could not extract real mesh data, using placeholder")
             return False
-
+    
     def save_analysis_report(self, data, start_pos):
         """Save detailed analysis report to file"""
         report_file = "cly_analysis_report.txt"
@@ -836,7 +1026,8 @@ class CLYParser:
         with open(report_file, 'w') as f:
             f.write("=== CLY File Analysis Report ===\n")
             f.write(f"File: {self.file_path}\n")
-            f.write(f"File size: {os.path.getsize(self.file_path)} bytes\n")
+            # The binary data runs from the end of the header to the end of the file
+            f.write(f"File size: {len(data) + start_pos} bytes\n")
             f.write(f"Binary data starts at: {start_pos}\n")
             f.write(f"Binary data size: {len(data)} bytes\n\n")
             
@@ -847,11 +1038,16 @@ class CLYParser:
             
             f.write("=== Deep Scan Results ===\n")
             
-            # Search for known markers
-            known_markers = ['FFDYNPKTObjectListMain', 'FFDYNPKTModelInfo', 'FFDYNPKTModelPreviewImage']
-            for marker in known_markers:
-                marker_bytes = marker.encode('ascii')
-                pos = data.find(marker_bytes)
+            # Search for known markers: one scan records the first offset of
+            # each, stopping as soon as all of them have been seen
+            first_offsets = {}
+            for match in KNOWN_MARKER_RE.finditer(data):
+                first_offsets.setdefault(match.group().decode('ascii'), match.start())
+                if len(first_offsets) == len(KNOWN_MARKERS):
+                    break
+            
+            for marker in KNOWN_MARKERS:
+                pos = first_offsets.get(marker, -1)
                 if pos != -1:
                     f.write(f"Found marker '{marker}' at offset {pos}\n")
                 else:
@@ -861,20 +1057,10 @@ class CLYParser:
             # Deep scan for ASCII markers
             f.write("=== ASCII Markers Found ===\n")
             ascii_markers = []
-            chunk_size = 100000
-            for chunk_start in range(0, len(data), chunk_size):
-                chunk_end = min(chunk_start + chunk_size, len(data))
-                chunk = data[chunk_start:chunk_end]
-                
-                for i in range(len(chunk) - 20):
-                    chunk_slice = chunk[i:i+20]
-                    try:
-                        text = chunk_slice.decode('ascii', errors='ignore')
-                        if text.isprintable() and len(text.strip()) > 5:
-                            global_offset = chunk_start + i
-                            ascii_markers.append((global_offset, text.strip()))
-                    except:
-                        pass
+            for match in ASCII_MARKER_RE.finditer(data):
+                text = match.group().decode('ascii').strip()
+                if len(text) > 5:
+                    ascii_markers.append((match.start(), text))
             
             # Show unique markers
             unique_markers = set()
@@ -901,24 +1087,19 @@ class CLYParser:
                 f.write(f"\nSection {section_start}-{section_end}:\n")
                 section_data = data[section_start:section_end]
                 
-                vertex_candidates = []
-                for i in range(0, len(section_data) - 12, 12):
-                    try:
-                        x, y, z = struct.unpack('<fff', section_data[i:i+12])
-                        if all(-1000 < val < 1000 for val in [x, y, z]) and \
-                           not any(np.isnan(val) for val in [x, y, z]) and \
-                           not any(np.isinf(val) for val in [x, y, z]) and \
-                           not (x == 0 and y == 0 and z == 0):
-                            global_offset = section_start + i
-                            vertex_candidates.append((global_offset, x, y, z))
-                    except:
-                        pass
+                # Range-check every float triplet in the section at once,
+                # skipping all-zero padding
+                record_count = max(0, (len(section_data) - 1) // 12)
+                records = np.frombuffer(section_data, dtype='<f4', count=record_count * 3).reshape(-1, 3)
+                valid = self._plausible_vertices(records, 1000) & (records != 0).any(axis=1)
+                candidate_offsets = section_start + np.flatnonzero(valid) * 12
                 
-                f.write(f"  Found {len(vertex_candidates)} vertex candidates\n")
-                total_vertex_candidates += len(vertex_candidates)
+                f.write(f"  Found {len(candidate_offsets)} vertex candidates\n")
+                total_vertex_candidates += len(candidate_offsets)
                 
                 # Show first few vertices from this section
-                for i, (offset, x, y, z) in enumerate(vertex_candidates[:10]):
+                first_candidates = zip(candidate_offsets[:10].tolist(), records[valid][:10].tolist())
+                for i, (offset, (x, y, z)) in enumerate(first_candidates):
                     f.write(f"    Vertex {i}: offset {offset}, pos ({x:.6f}, {y:.6f}, {z:.6f})\n")
             
             f.write(f"\nTotal vertex candidates across all sections: {total_vertex_candidates}\n")
@@ -926,14 +1107,18 @@ class CLYParser:
             # Look for patterns in the data
             f.write("\n=== Data Pattern Analysis ===\n")
             
-            # Check for non-zero data patterns
-            non_zero_sections = []
+            # Check for non-zero data patterns: count every full section in one
+            # pass over a (sections, section_size) view, then the short tail
             section_size = 10000
-            for i in range(0, len(data), section_size):
-                section = data[i:i+section_size]
-                non_zero_count = sum(1 for b in section if b != 0)
-                if non_zero_count > 100:  # More than 1% non-zero
-                    non_zero_sections.append((i, non_zero_count))
+            byte_values = np.frombuffer(data, dtype=np.uint8)
+            full_sections = len(byte_values) // section_size
+            non_zero_counts = np.count_nonzero(
+                byte_values[:full_sections * section_size].reshape(-1, section_size), axis=1)
+            if len(byte_values) % section_size:
+                non_zero_counts = np.append(non_zero_counts, np.count_nonzero(byte_values[full_sections * section_size:]))
+            
+            significant = np.flatnonzero(non_zero_counts > 100)  # More than 1% non-zero
+            non_zero_sections = list(zip((significant * section_size).tolist(), non_zero_counts[significant].tolist()))
             
             f.write(f"Found {len(non_zero_sections)} sections with significant non-zero data\n")
             for offset, count in non_zero_sections[:20]:
@@ -942,24 +1127,22 @@ class CLYParser:
             # Look for potential data structures
             f.write("\n=== Potential Data Structures ===\n")
             
-            # Look for repeated patterns
+            # Look for repeated patterns: view the aligned 16-byte records as
+            # opaque V16 items and count them with one sort
             pattern_length = 16
-            patterns = {}
-            for i in range(0, min(len(data), 100000) - pattern_length, pattern_length):
-                pattern = data[i:i+pattern_length]
-                if pattern in patterns:
-                    patterns[pattern] += 1
-                else:
-                    patterns[pattern] = 1
+            pattern_count = max(0, (min(len(data), 100000) - 1) // pattern_length)
+            records = np.frombuffer(data, dtype=f'V{pattern_length}', count=pattern_count)
+            patterns, first_seen, counts = np.unique(records, return_index=True, return_counts=True)
             
-            common_patterns = sorted(patterns.items(), key=lambda x: x[1], reverse=True)[:10]
+            # Most frequent first; ties keep the order patterns first appear in
+            common_patterns = np.lexsort((first_seen, -counts))[:10]
             f.write("Most common 16-byte patterns:\n")
-            for pattern, count in common_patterns:
-                if count > 1:
-                    f.write(f"  Pattern {binascii.hexlify(pattern).decode()}: {count} occurrences\n")
+            for i in common_patterns.tolist():
+                if counts[i] > 1:
+                    f.write(f"  Pattern {binascii.hexlify(patterns[i].tobytes()).decode()}: {counts[i]} occurrences\n")
         
         self.logger.info(f"Comprehensive analysis report saved to {report_file}")
-
+    
     def parse_freestyle_format(self, data):
         """Parse FreeStyle format based on analysis insights"""
         self.logger.info("=== Parsing FreeStyle Format ===")
@@ -970,8 +1153,9 @@ class CLYParser:
         # - Bitmap info: 0 192054
         # - File version: 4
         
-        vertices = []
-        faces = []
+        vertex_blocks = []
+        face_blocks = []
+        vertex_offset = 0
         
         try:
             # Look for the binary data section after the ASCII header
@@ -982,7 +1166,8 @@ class CLYParser:
                 self.logger.error("Binary data section not found")
                 return self.create_placeholder_mesh()
             
-            binary_data = data[binary_start:]
+            # A view, so a mapped file's binary section is never copied into memory
+            binary_data = memoryview(data)[binary_start:]
             self.logger.info(f"Binary data size: {len(binary_data)} bytes")
             
             # Look for mesh data patterns
@@ -997,18 +1182,17 @@ class CLYParser:
                     
                     section_vertices, section_faces = self._parse_mesh_section(binary_data, section)
                     
-                    if section_vertices and section_faces:
+                    if len(section_vertices) and len(section_faces):
                         # Adjust face indices to account for previous vertices
-                        vertex_offset = len(vertices)
-                        adjusted_faces = [[f[0] + vertex_offset, f[1] + vertex_offset, f[2] + vertex_offset] 
-                                        for f in section_faces]
-                        
-                        vertices.extend(section_vertices)
-                        faces.extend(adjusted_faces)
+                        vertex_blocks.append(section_vertices)
+                        face_blocks.append(section_faces + vertex_offset)
+                        vertex_offset += len(section_vertices)
                         
                         self.logger.info(f"  Added {len(section_vertices)} vertices and {len(section_faces)} faces")
             
-            if vertices and faces:
+            if vertex_blocks:
+                vertices = np.concatenate(vertex_blocks)
+                faces = np.concatenate(face_blocks)
                 self.logger.info(f"Successfully extracted {len(vertices)} total vertices and {len(faces)} total faces")
                 return vertices, faces
             else:
@@ -1018,64 +1202,64 @@ class CLYParser:
         except Exception as e:
             self.logger.error(f"Error parsing FreeStyle format: {e}", exc_info=True)
             return self.create_placeholder_mesh()
+        finally:
+            # Don't keep the buffer alive (or exported) past this parse
+            self._release_views()
     
     def _find_mesh_sections(self, data):
         """Find potential mesh data sections in the binary data"""
-        sections = []
-        
         # Look for patterns that indicate mesh data
-        # Common patterns: vertex count followed by float data
-        for offset in range(0, len(data) - 100, 100):  # Sample every 100 bytes
-            try:
-                # Try to read a potential vertex count
-                vertex_count = struct.unpack('<I', data[offset:offset+4])[0]
-                
-                # Sanity check
-                if vertex_count > 0 and vertex_count < 100000:
-                    # Check if there's enough data for vertices
-                    vertex_data_size = vertex_count * 3 * 4  # 3 floats per vertex
-                    
-                    if offset + 4 + vertex_data_size + 4 <= len(data):  # count + vertices + triangle count
-                        # Try to read a few vertices to validate
-                        valid_vertices = 0
-                        pos = offset + 4
-                        
-                        for i in range(min(vertex_count, 10)):  # Check first 10 vertices
-                            if pos + 12 <= len(data):
-                                try:
-                                    x = struct.unpack('<f', data[pos:pos+4])[0]
-                                    y = struct.unpack('<f', data[pos+4:pos+8])[0]
-                                    z = struct.unpack('<f', data[pos+8:pos+12])[0]
-                                    
-                                    # Check if coordinates are reasonable
-                                    if -10000 < x < 10000 and -10000 < y < 10000 and -10000 < z < 10000:
-                                        valid_vertices += 1
-                                    
-                                    pos += 12
-                                except:
-                                    break
-                        
-                        # If we found reasonable vertices, this might be a mesh section
-                        if valid_vertices >= 5:  # At least 5 valid vertices
-                            sections.append({
-                                'offset': offset,
-                                'vertex_count': vertex_count,
-                                'confidence': valid_vertices / min(vertex_count, 10)
-                            })
-                
-            except:
-                continue
-        
-        # Sort by confidence
-        sections.sort(key=lambda x: x['confidence'], reverse=True)
-        
-        # Limit to top sections
-        return sections[:10]
+        # Common patterns: vertex count followed by float data. Read every
+        # 4-byte aligned word as both a potential vertex count and a float
+        counts, floats = self._aligned_words(data)
+        word_count = (max(len(data) - 100, 0) + 3) // 4
+        first_vertex_words = 1 + 3 * np.arange(10)
+        
+        # Best sections so far as (words, vertex counts, confidence) arrays
+        top_words = np.empty(0, dtype=np.int64)
+        top_counts = np.empty(0, dtype=np.int64)
+        top_confidence = np.empty(0, dtype=np.float64)
+        
+        # Scan in fixed-size blocks of words so the temporaries stay small
+        # however large the file is
+        for block_start in range(0, word_count, MESH_SCAN_BLOCK):
+            block = counts[block_start:min(block_start + MESH_SCAN_BLOCK, word_count)]
+            
+            # Sanity check the counts first: few words pass, and only those
+            # are checked for room for the vertices plus the triangle count
+            # that follows them
+            words = np.flatnonzero((block > 0) & (block < 100000)) + block_start
+            vertex_counts = counts[words].astype(np.int64)
+            fits = words * 4 + 4 + vertex_counts * 12 + 4 <= len(data)
+            words = words[fits]
+            vertex_counts = vertex_counts[fits]
+            
+            # Validate the first 10 vertices of every candidate at once; the
+            # fit check keeps every vertex that is counted inside the data
+            checked = np.minimum(vertex_counts, 10)
+            coordinate_words = np.minimum((words[:, None] + first_vertex_words)[:, :, None] + np.arange(3),
+                                          len(floats) - 1)
+            vertex_ok = (np.abs(floats[coordinate_words]) < 10000).all(axis=2)
+            valid_vertices = (vertex_ok & (np.arange(10) < checked[:, None])).sum(axis=1)
+            
+            # If we found reasonable vertices, this might be a mesh section;
+            # merge the block's sections into the top 10 by confidence,
+            # earlier offsets first on ties
+            keep = valid_vertices >= 5  # At least 5 valid vertices
+            top_words = np.concatenate([top_words, words[keep]])
+            top_counts = np.concatenate([top_counts, vertex_counts[keep]])
+            top_confidence = np.concatenate([top_confidence, valid_vertices[keep] / checked[keep]])
+            top = np.argsort(-top_confidence, kind='stable')[:10]
+            top_words, top_counts, top_confidence = top_words[top], top_counts[top], top_confidence[top]
+        
+        return [
+            {'offset': word * 4, 'vertex_count': vertex_count, 'confidence': confidence}
+            for word, vertex_count, confidence in zip(top_words.tolist(), top_counts.tolist(), top_confidence.tolist())
+        ]
     
     def _parse_mesh_section(self, data, section):
-        """Parse a mesh section"""
-        vertices = []
-        faces = []
+        """Parse a mesh section into float32 vertex and uint32 face arrays"""
+        vertices, faces = self._empty_mesh()
         
         try:
             offset = section['offset']
@@ -1083,44 +1267,32 @@ class CLYParser:
             
             # Read vertices
             pos = offset + 4
-            for i in range(vertex_count):
-                if pos + 12 <= len(data):
-                    x = struct.unpack('<f', data[pos:pos+4])[0]
-                    y = struct.unpack('<f', data[pos+4:pos+8])[0]
-                    z = struct.unpack('<f', data[pos+8:pos+12])[0]
-                    
-                    # Final validation
-                    if -10000 < x < 10000 and -10000 < y < 10000 and -10000 < z < 10000:
-                        vertices.append([x, y, z])
-                    else:
-                        break  # Invalid vertex data
-                    
-                    pos += 12
-                else:
-                    break
+            available = max(0, min(vertex_count, (len(data) - pos) // 12))
+            section_vertices = np.frombuffer(data, dtype='<f4', count=available * 3, offset=pos).reshape(-1, 3)
+            
+            # Final validation: keep the vertices up to the first invalid one
+            invalid = np.flatnonzero(~self._plausible_vertices(section_vertices, 10000))
+            if len(invalid):
+                section_vertices = section_vertices[:invalid[0]]
+            
+            vertices = section_vertices
+            pos += len(vertices) * 12
             
             # If we have vertices, try to read triangles
             if len(vertices) == vertex_count:
                 if pos + 4 <= len(data):
-                    tri_count = struct.unpack('<I', data[pos:pos+4])[0]
+                    tri_count = UINT32.unpack_from(data, pos)[0]
                     pos += 4
                     
                     if tri_count > 0 and tri_count < 100000:
-                        for i in range(tri_count):
-                            if pos + 12 <= len(data):
-                                i1 = struct.unpack('<I', data[pos:pos+4])[0]
-                                i2 = struct.unpack('<I', data[pos+4:pos+8])[0]
-                                i3 = struct.unpack('<I', data[pos+8:pos+12])[0]
-                                
-                                # Validate indices
-                                if i1 < vertex_count and i2 < vertex_count and i3 < vertex_count:
-                                    faces.append([i1, i2, i3])
-                                else:
-                                    break  # Invalid face indices
-                                
-                                pos += 12
-                            else:
-                                break
+                        available = min(tri_count, (len(data) - pos) // 12)
+                        section_faces = np.frombuffer(data, dtype='<u4', count=available * 3, offset=pos).reshape(-1, 3)
+                        
+                        # Validate indices: keep the faces up to the first invalid one
+                        invalid = np.flatnonzero(~(section_faces < vertex_count).all(axis=1))
+                        if len(invalid):
+                            section_faces = section_faces[:invalid[0]]
+                        faces = section_faces
         
         except Exception as e:
             self.logger.warning(f"Error parsing mesh section: {e}")
@@ -1179,47 +1351,46 @@ class CLYParser:
             self._find_mesh_by_dimensions
         ]
         
-        for i, strategy in enumerate(strategies):
-            self.logger.info(f"Trying strategy {i+1}: {strategy.__name__}")
-            
-            try:
-                if strategy == self._find_mesh_sections:
-                    sections = strategy(data)
-                    if sections:
-                        vertices, faces = self._extract_from_sections(data, sections)
-                        if vertices and faces:
+        # The strategies share the decoded views of data, built by whichever needs them first
+        try:
+            for i, strategy in enumerate(strategies):
+                self.logger.info(f"Trying strategy {i+1}: {strategy.__name__}")
+                
+                try:
+                    if strategy == self._find_mesh_sections:
+                        sections = strategy(data)
+                        if sections:
+                            vertices, faces = self._extract_from_sections(data, sections)
+                            if len(vertices) and len(faces):
+                                return vertices, faces
+                    elif strategy == self._find_mesh_by_patterns:
+                        vertices, faces = strategy(data)
+                        if len(vertices) and len(faces):
                             return vertices, faces
-                elif strategy == self._find_mesh_by_patterns:
-                    vertices, faces = strategy(data)
-                    if vertices and faces:
-                        return vertices, faces
-                elif strategy == self._find_mesh_by_dimensions:
-                    vertices, faces = strategy(data)
-                    if vertices and faces:
-                        return vertices, faces
-            except Exception as e:
-                self.logger.warning(f"Strategy {i+1} failed: {e}")
-                continue
-        
-        return [], []
+                    elif strategy == self._find_mesh_by_dimensions:
+                        vertices, faces = strategy(data)
+                        if len(vertices) and len(faces):
+                            return vertices, faces
+                except Exception as e:
+                    self.logger.warning(f"Strategy {i+1} failed: {e}")
+                    continue
+        finally:
+            # Don't keep the buffer alive (or exported) past this extraction
+            self._release_views()
+        
+        return self._empty_mesh()
     
     def _find_mesh_by_patterns(self, data):
         """Find mesh data using pattern matching from analysis"""
         self.logger.info("=== Pattern-based mesh search ===")
         
-        # Look for the patterns mentioned in analysis
-        patterns = [b'aaaaaaaa', b'!!!!!!!!', b'QQQQQQQQ']
+        # Look for the patterns mentioned in analysis, collecting the
+        # non-overlapping positions of all of them in one scan
+        pattern_positions = {pattern: [] for pattern in MESH_PATTERNS}
+        for match in MESH_PATTERN_RE.finditer(data):
+            pattern_positions[match.group()].append(match.start())
         
-        for pattern in patterns:
-            positions = []
-            pos = 0
-            while True:
-                pos = data.find(pattern, pos)
-                if pos == -1:
-                    break
-                positions.append(pos)
-                pos += len(pattern)
-            
+        for pattern, positions in pattern_positions.items():
             self.logger.info(f"Found {len(positions)} instances of pattern {pattern}")
             
             # Look for mesh data near these patterns
@@ -1229,16 +1400,16 @@ class CLYParser:
                     check_pos = pos + offset
                     if 0 <= check_pos < len(data) - 100:
                         try:
-                            vertex_count = struct.unpack('<I', data[check_pos:check_pos+4])[0]
+                            vertex_count = UINT32.unpack_from(data, check_pos)[0]
                             if 0 < vertex_count < 100000:
                                 # Try to extract mesh from this position
                                 vertices, faces = self._extract_mesh_at_position(data, check_pos)
-                                if vertices and faces:
+                                if len(vertices) and len(faces):
                                     return vertices, faces
                         except:
                             continue
         
-        return [], []
+        return self._empty_mesh()
     
     def _find_mesh_by_dimensions(self, data):
         """Find mesh data using known dimensions from analysis"""
@@ -1247,103 +1418,83 @@ class CLYParser:
         # Use the known dimensions to look for vertex data
         expected_dims = [471.5353, 508.5413, 502.2654]
         
-        # Look for sequences of floats that match the expected scale
-        for offset in range(0, len(data) - 1000, 100):
-            try:
-                # Check if this region contains vertex-like data
-                vertex_count = struct.unpack('<I', data[offset:offset+4])[0]
-                
-                if 0 < vertex_count < 100000:
-                    # Check if the first few vertices are within reasonable bounds
-                    pos = offset + 4
-                    valid_vertices = 0
-                    
-                    for i in range(min(vertex_count, 10)):
-                        if pos + 12 <= len(data):
-                            x = struct.unpack('<f', data[pos:pos+4])[0]
-                            y = struct.unpack('<f', data[pos+4:pos+8])[0]
-                            z = struct.unpack('<f', data[pos+8:pos+12])[0]
-                            
-                            # Check if coordinates are within expected range
-                            if (0 <= x <= expected_dims[0] and 
-                                0 <= y <= expected_dims[1] and 
-                                0 <= z <= expected_dims[2]):
-                                valid_vertices += 1
-                            
-                            pos += 12
-                    
-                    if valid_vertices >= 5:  # At least 5 vertices in expected range
-                        vertices, faces = self._extract_mesh_at_position(data, offset)
-                        if vertices and faces:
-                            return vertices, faces
-            
-            except:
-                continue
+        # Look for sequences of floats that match the expected scale: every
+        # 100th offset is a 4-byte aligned word holding a potential vertex count
+        counts, floats = self._aligned_words(data)
+        offsets = np.arange(0, max(len(data) - 1000, 0), 100)
+        words = offsets // 4
+        vertex_counts = counts[words].astype(np.int64)
+        
+        # in_box[w]: the three floats starting at word w are within the expected
+        # range (compared in float64, like the Python floats they replace)
+        x_ok, y_ok, z_ok = ((floats >= 0) & (floats <= np.float64(limit)) for limit in expected_dims)
+        in_box = x_ok[:-2] & y_ok[1:-1] & z_ok[2:]
+        
+        # Check if the first few vertices of every candidate are within range
+        valid_vertices = np.zeros(len(words), dtype=np.int64)
+        for i in range(10):
+            checked = (i < vertex_counts) & (offsets + 4 + 12 * i + 12 <= len(data))
+            first_word = np.where(checked, words + 1 + 3 * i, 0)
+            valid_vertices += checked & in_box[first_word]
+        
+        # At least 5 vertices in expected range
+        candidate = (vertex_counts > 0) & (vertex_counts < 100000) & (valid_vertices >= 5)
+        for offset in offsets[candidate].tolist():
+            vertices, faces = self._extract_mesh_at_position(data, offset)
+            if len(vertices) and len(faces):
+                return vertices, faces
         
-        return [], []
+        return self._empty_mesh()
     
     def _extract_mesh_at_position(self, data, offset):
         """Extract mesh data from a specific position"""
         try:
-            vertex_count = struct.unpack('<I', data[offset:offset+4])[0]
+            vertex_count = UINT32.unpack_from(data, offset)[0]
             pos = offset + 4
             
-            vertices = []
-            for i in range(vertex_count):
-                if pos + 12 <= len(data):
-                    x = struct.unpack('<f', data[pos:pos+4])[0]
-                    y = struct.unpack('<f', data[pos+4:pos+8])[0]
-                    z = struct.unpack('<f', data[pos+8:pos+12])[0]
-                    vertices.append([x, y, z])
-                    pos += 12
-                else:
-                    break
-            
-            if len(vertices) == vertex_count:
+            # The whole vertex block must fit in the data
+            if pos + vertex_count * 12 <= len(data):
+                vertices = np.frombuffer(data, dtype='<f4', count=vertex_count * 3, offset=pos).reshape(-1, 3)
+                pos += vertex_count * 12
+                
                 # Try to read triangles
                 if pos + 4 <= len(data):
-                    tri_count = struct.unpack('<I', data[pos:pos+4])[0]
+                    tri_count = UINT32.unpack_from(data, pos)[0]
                     pos += 4
                     
-                    faces = []
-                    for i in range(tri_count):
-                        if pos + 12 <= len(data):
-                            i1 = struct.unpack('<I', data[pos:pos+4])[0]
-                            i2 = struct.unpack('<I', data[pos+4:pos+8])[0]
-                            i3 = struct.unpack('<I', data[pos+8:pos+12])[0]
-                            
-                            if i1 < vertex_count and i2 < vertex_count and i3 < vertex_count:
-                                faces.append([i1, i2, i3])
-                            
-                            pos += 12
-                        else:
-                            break
-                    
-                    if len(faces) == tri_count:
-                        return vertices, faces
+                    # Every triangle must fit and index a vertex we read
+                    if pos + tri_count * 12 <= len(data):
+                        faces = np.frombuffer(data, dtype='<u4', count=tri_count * 3, offset=pos).reshape(-1, 3)
+                        if (faces < vertex_count).all():
+                            # Copy out so the result never pins the caller's (possibly mapped) buffer
+                            return vertices.copy(), faces.copy()
         
         except Exception as e:
             self.logger.warning(f"Error extracting mesh at position {offset}: {e}")
         
-        return [], []
+        return self._empty_mesh()
     
     def _extract_from_sections(self, data, sections):
         """Extract mesh data from multiple sections"""
-        all_vertices = []
-        all_faces = []
-        
+        meshes = []
         for section in sections:
             vertices, faces = self._parse_mesh_section(data, section)
-            if vertices and faces:
-                # Adjust face indices
-                vertex_offset = len(all_vertices)
-                adjusted_faces = [[f[0] + vertex_offset, f[1] + vertex_offset, f[2] + vertex_offset] 
-                                for f in faces]
-                
-                all_vertices.extend(vertices)
-                all_faces.extend(adjusted_faces)
-        
-        return all_vertices, all_faces
+            if len(vertices) and len(faces):
+                meshes.append((vertices, faces))
+        
+        if not meshes:
+            return self._empty_mesh()
+        
+        # Write each section's faces straight into one preallocated array,
+        # adjusting their indices in the same pass
+        vertices = np.concatenate([section_vertices for section_vertices, _ in meshes])
+        faces = np.empty((sum(len(section_faces) for _, section_faces in meshes), 3), dtype=np.uint32)
+        row = vertex_offset = 0
+        for section_vertices, section_faces in meshes:
+            np.add(section_faces, vertex_offset, out=faces[row:row + len(section_faces)])
+            row += len(section_faces)
+            vertex_offset += len(section_vertices)
+        return vertices, faces
 
 class ReverseEngineerCLY:
     def __init__(self):
@@ -1356,51 +1507,69 @@ class ReverseEngineerCLY:
             'chunk_analysis': [],
             'conversion_insights': []
         }
+        self._views_source = None
+        self._views = {}
+        self._sample_offsets = None  # File offset of each sample window, when sampling
+        self._sample_window = None  # Bytes per sample window, when sampling
+        self.results_timestamp = None  # Set once the full results have been saved
     
-    def reverse_engineer_cly_file(self, file_path):
+    def reverse_engineer_cly_file(self, file_path, full=False):
         """
         Deep analysis of .cly file structure without conversion.
         Gathers comprehensive insights about the file format.
+        Files over ANALYSIS_SAMPLE_THRESHOLD are analyzed from evenly spaced
+        sample windows unless full is set, or the windows would cover the
+        whole file anyway.
         """
         self.logger.info(f"Starting deep reverse engineering of: {file_path}")
         
         try:
-            with open(file_path, 'rb') as f:
-                data = f.read()
-            
-            file_size = len(data)
-            self.analysis_data['file_info'] = {
-                'file_path': file_path,
-                'file_size': file_size,
-                'analysis_timestamp': datetime.now().isoformat(),
-                'file_size_mb': file_size / (1024 * 1024)
-            }
-            
-            self.logger.info(f"File size: {file_size:,} bytes ({file_size / (1024 * 1024):.2f} MB)")
-            
-            # 1. Header Analysis
-            self._analyze_header(data)
-            
-            # 2. Magic Numbers and Signatures
-            self._find_magic_numbers(data)
-            
-            # 3. ASCII String Analysis
-            self._analyze_ascii_strings(data)
-            
-            # 4. Binary Pattern Analysis
-            self._analyze_binary_patterns(data)
-            
-            # 5. Data Structure Analysis
-            self._analyze_data_structures(data)
-            
-            # 6. Chunk Analysis
-            self._analyze_chunks(data)
-            
-            # 7. Generate Conversion Insights
-            self._generate_conversion_insights()
-            
-            # Save analysis results
-            self._save_analysis_results()
+            # Map the file rather than reading it: the OS pages it in on demand
+            # and the NumPy scans view it without copying; the cached views are
+            # released before the mapping is closed
+            with open(file_path, 'rb') as f, map_file(f) as data, self._holding_views():
+                file_size = len(data)
+                self.analysis_data['file_info'] = {
+                    'file_path': file_path,
+                    'file_size': file_size,
+                    'analysis_timestamp': datetime.now().isoformat(),
+                    'file_size_mb': file_size / (1024 * 1024)
+                }
+                
+                self.logger.info(f"File size: {file_size:,} bytes ({file_size / (1024 * 1024):.2f} MB)")
+                
+                # 1. Header Analysis
+                self._analyze_header(data)
+                
+                # Offsets found in a sample are mapped back to the file, and
+                # matches spanning the seam between two windows are dropped.
+                # Windows are a whole number of words so the word scans read
+                # the file's own strides
+                window = max(4, app.config['ANALYSIS_SAMPLE_WINDOW'] // 4 * 4)
+                windows_fit = window * app.config['ANALYSIS_SAMPLE_COUNT'] < file_size
+                if not full and file_size > app.config['ANALYSIS_SAMPLE_THRESHOLD'] and windows_fit:
+                    data = self._sample_windows(data, window)
+                
+                # 2. Magic Numbers and Signatures
+                self._find_magic_numbers(data)
+                
+                # 3. ASCII String Analysis
+                self._analyze_ascii_strings(data)
+                
+                # 4. Binary Pattern Analysis
+                self._analyze_binary_patterns(data)
+                
+                # 5. Data Structure Analysis
+                self._analyze_data_structures(data, file_size)
+                
+                # 6. Chunk Analysis
+                self._analyze_chunks(data)
+                
+                # 7. Generate Conversion Insights
+                self._generate_conversion_insights()
+                
+                # Save analysis results
+                self._save_analysis_results()
             
             return self.analysis_data
             
@@ -1408,6 +1577,100 @@ class ReverseEngineerCLY:
             self.logger.error(f"Error during reverse engineering: {str(e)}")
             return None
     
+    def _sample_windows(self, data, window):
+        """Return evenly spaced, non-overlapping windows of data joined together, recording where each came from"""
+        # Starts are 4-byte aligned like the window length, which keeps
+        # windows at least a window apart from each other
+        starts = np.linspace(0, len(data) - window, app.config['ANALYSIS_SAMPLE_COUNT']).astype(int) // 4 * 4
+        starts = sorted(set(starts.tolist()))
+        
+        self.analysis_data['file_info']['sampled'] = True
+        self.analysis_data['file_info']['sample_windows'] = [
+            {'file_offset': start, 'sample_offset': index * window, 'length': window}
+            for index, start in enumerate(starts)
+        ]
+        self._sample_offsets = np.array(starts, dtype=np.int64)
+        self._sample_window = window
+        self.logger.info(f"Analyzing {len(starts)} sample windows of {window:,} bytes")
+        return b''.join(data[start:start + window] for start in starts)
+    
+    def _file_positions(self, starts, lengths, runs=False):
+        """
+        Map the offsets of matches in the data being analyzed to file offsets.
+        Returns (keep, positions): keep masks out the matches that span the seam
+        between two sample windows and, for runs, those touching a window edge
+        they may continue past in the file.
+        """
+        starts = np.asarray(starts, dtype=np.int64)
+        if self._sample_offsets is None:
+            return np.ones(len(starts), dtype=bool), starts
+        
+        window = self._sample_window
+        ends = starts + lengths
+        indices = starts // window
+        keep = indices == (ends - 1) // window
+        if runs:
+            keep &= (ends % window != 0) & ((starts % window != 0) | (indices == 0))
+        positions = self._sample_offsets[np.minimum(indices, len(self._sample_offsets) - 1)] + starts % window
+        return keep, positions
+    
+    def _buffer_views(self, data):
+        """Return the cache of results derived from data, starting a new one for a different buffer"""
+        if self._views_source is not data:
+            self._views_source = data
+            self._views = {}
+        return self._views
+    
+    @contextmanager
+    def _holding_views(self):
+        """Drop the cached views, the sample layout and the reference to their buffer on leaving the block"""
+        try:
+            yield
+        finally:
+            self._views_source = None
+            self._views = {}
+            self._sample_offsets = None
+            self._sample_window = None
+    
+    def _words(self, data):
+        """Return (uint32, int32) views of the 4-byte strides of data followed by at least one byte, built once per buffer"""
+        views = self._buffer_views(data)
+        if 'words' not in views:
+            u32 = np.frombuffer(data, dtype='<u4', count=max(0, (len(data) - 1) // 4))
+            views['words'] = (u32, u32.view('<i4'))
+        return views['words']
+    
+    def _words_at_every_byte(self, data):
+        """Return a uint32 view of data read at every byte offset, built once per buffer"""
+        views = self._buffer_views(data)
+        if 'every_byte' not in views:
+            views['every_byte'] = np.ndarray((max(len(data) - 3, 0),), dtype='<u4', buffer=data, strides=(1,))
+        return views['every_byte']
+    
+    def _signature_positions(self, data):
+        """Return {signature: file offsets} for every SIGNATURES entry, located once per buffer"""
+        views = self._buffer_views(data)
+        if 'signatures' not in views:
+            views['signatures'] = {}
+            for signature in SIGNATURES:
+                keep, positions = self._file_positions(self._find_all(data, signature), len(signature))
+                views['signatures'][signature] = positions[keep].tolist()
+        return views['signatures']
+    
+    def _find_all(self, data, pattern):
+        """Return the offsets of every, possibly overlapping, occurrence of pattern in data"""
+        positions = []
+        pos = data.find(pattern)
+        while pos != -1:
+            positions.append(pos)
+            if len(positions) == DENSE_SIGNATURE_HITS and len(pattern) == 4:
+                # Too many hits to walk one find at a time: match the rest at once
+                rest = self._words_at_every_byte(data)[pos + 1:]
+                positions.extend((np.flatnonzero(rest == UINT32.unpack(pattern)[0]) + pos + 1).tolist())
+                break
+            pos = data.find(pattern, pos + 1)
+        return positions
+    
     def _analyze_header(self, data):
         """Analyze the first 1KB of the file for header structure"""
         self.logger.info("Analyzing file header...")
@@ -1433,23 +1696,11 @@ class ReverseEngineerCLY:
         self.logger.info("Searching for magic numbers and signatures...")
         
         magic_numbers = []
+        signature_positions = self._signature_positions(data)
         
         # Common magic numbers to look for
-        common_magics = [
-            b'CLYF', b'CLAY', b'CLY', b'3D', b'OBJ', b'STL',
-            b'\x00\x00\x00\x00', b'\xFF\xFF\xFF\xFF',
-            b'\x00\x00\x80\x3F', b'\x00\x00\x00\x40'  # Common float values
-        ]
-        
-        for magic in common_magics:
-            positions = []
-            start = 0
-            while True:
-                pos = data.find(magic, start)
-                if pos == -1:
-                    break
-                positions.append(pos)
-                start = pos + 1
+        for magic in COMMON_MAGICS:
+            positions = signature_positions[magic]
             
             if positions:
                 magic_numbers.append({
@@ -1465,41 +1716,48 @@ class ReverseEngineerCLY:
         """Extract and analyze ASCII strings in the file"""
         self.logger.info("Analyzing ASCII strings...")
         
-        strings = []
-        current_string = ""
-        string_positions = []
-        
-        for i, byte in enumerate(data):
-            if 32 <= byte <= 126:  # Printable ASCII
-                current_string += chr(byte)
-            else:
-                if len(current_string) >= 4:  # Only keep strings of 4+ characters
+        strings = []  # The first 100, kept for readability
+        string_frequency = {}
+        total_strings = 0
+        
+        # Printable runs of 4+ characters, grouped by their raw bytes so each
+        # distinct run is decoded once; a run still open at the end of the
+        # data has no terminating byte and is not counted. A sample is
+        # scanned window by window, skipping runs cut off by a window's start
+        if self._sample_offsets is None:
+            window, file_offsets = len(data), [0]
+        else:
+            window, file_offsets = self._sample_window, self._sample_offsets.tolist()
+        for index, file_offset in enumerate(file_offsets):
+            start, end = index * window, (index + 1) * window
+            for match in ASCII_STRING_RE.finditer(data, start, end):
+                if match.end() == end:
+                    break
+                if match.start() == start and file_offset:
+                    continue
+                run = match.group()
+                position = match.start() - start + file_offset
+                if total_strings < 100:
                     strings.append({
-                        'string': current_string,
-                        'position': i - len(current_string),
-                        'length': len(current_string)
+                        'string': run.decode('ascii'),
+                        'position': position,
+                        'length': len(run)
                     })
-                current_string = ""
-        
-        # Sort by length and frequency
-        string_frequency = {}
-        for s in strings:
-            key = s['string']
-            if key not in string_frequency:
-                string_frequency[key] = []
-            string_frequency[key].append(s['position'])
+                total_strings += 1
+                string_frequency.setdefault(run, []).append(position)
         
-        # Get most common strings
-        common_strings = sorted(string_frequency.items(), key=lambda x: len(x[1]), reverse=True)[:20]
+        # Get most common strings: a bounded top-20 selection, ordered like a
+        # stable sort by count
+        common_strings = heapq.nlargest(20, string_frequency.items(), key=lambda x: len(x[1]))
         
         self.analysis_data['data_patterns']['ascii_strings'] = {
-            'total_strings': len(strings),
+            'total_strings': total_strings,
             'unique_strings': len(string_frequency),
-            'common_strings': [{'string': s[0], 'count': len(s[1]), 'positions': s[1]} for s in common_strings],
-            'all_strings': strings[:100]  # Limit to first 100 for readability
+            'common_strings': [{'string': s[0].decode('ascii'), 'count': len(s[1]), 'positions': s[1]} for s in common_strings],
+            'all_strings': strings
         }
         
-        self.logger.info(f"Found {len(strings)} ASCII strings, {len(string_frequency)} unique")
+        self.logger.info(f"Found {total_strings} ASCII strings, {len(string_frequency)} unique")
     
     def _analyze_binary_patterns(self, data):
         """Analyze binary patterns and data structures"""
@@ -1509,64 +1767,60 @@ class ReverseEngineerCLY:
             'zero_sequences': [],
             'repeating_bytes': [],
             'float_candidates': [],
-            'int_candidates': []
+            'float_candidate_count': 0,
+            'int_candidates': [],
+            'int_candidate_count': 0
         }
         
-        # Find sequences of zeros
-        zero_seq_start = None
-        for i, byte in enumerate(data):
-            if byte == 0:
-                if zero_seq_start is None:
-                    zero_seq_start = i
-            else:
-                if zero_seq_start is not None:
-                    seq_len = i - zero_seq_start
-                    if seq_len >= 4:  # Only track sequences of 4+ zeros
-                        patterns['zero_sequences'].append({
-                            'start': zero_seq_start,
-                            'length': seq_len
-                        })
-                    zero_seq_start = None
-        
-        # Find repeating byte patterns
-        for i in range(len(data) - 3):
-            pattern = data[i:i+4]
-            if pattern.count(pattern[0]) == 4:  # All bytes same
-                patterns['repeating_bytes'].append({
-                    'position': i,
-                    'byte': pattern[0],
-                    'length': 4
-                })
-        
-        # Look for potential float values (4 bytes)
-        for i in range(0, len(data) - 4, 4):
-            try:
-                float_val = struct.unpack('f', data[i:i+4])[0]
-                if -1000 < float_val < 1000:  # Reasonable range
-                    patterns['float_candidates'].append({
-                        'position': i,
-                        'value': float_val
-                    })
-            except:
-                pass
-        
-        # Look for potential int values (4 bytes)
-        for i in range(0, len(data) - 4, 4):
-            try:
-                int_val = struct.unpack('i', data[i:i+4])[0]
-                if 0 <= int_val < 1000000:  # Reasonable range
-                    patterns['int_candidates'].append({
-                        'position': i,
-                        'value': int_val
-                    })
-            except:
-                pass
+        byte_values = np.frombuffer(data, dtype=np.uint8)
+        
+        # Find sequences of zeros: run edges are where the padded zero mask
+        # flips; a run still open at the end of the data is not counted
+        is_zero = np.concatenate(([False], byte_values == 0, [False]))
+        edges = np.diff(is_zero.view(np.int8))
+        run_starts = np.flatnonzero(edges == 1)
+        run_ends = np.flatnonzero(edges == -1)
+        run_lengths = run_ends - run_starts
+        keep, run_starts = self._file_positions(run_starts, run_lengths, runs=True)
+        keep &= (run_lengths >= 4) & (run_ends < len(data))  # Only track sequences of 4+ zeros
+        patterns['zero_sequences'] = RecordList(start=run_starts[keep], length=run_lengths[keep])
+        
+        # Find repeating byte patterns: every 4-byte window whose bytes are all
+        # the same, i.e. that starts three same-as-neighbour bytes in a row
+        if len(data) >= 4:
+            same_as_next = byte_values[:-1] == byte_values[1:]
+            same = same_as_next[:-2] & same_as_next[1:-1] & same_as_next[2:]
+            positions = np.flatnonzero(same)
+            keep, file_positions = self._file_positions(positions, 4)
+            patterns['repeating_bytes'] = RecordList(position=file_positions[keep], byte=byte_values[positions[keep]], length=4)
+        
+        # Look for potential float and int values (4 bytes): reinterpret every
+        # 4-byte stride that has at least one byte after it in one go. Nearly
+        # every stride qualifies, so only the first ANALYSIS_CANDIDATE_LIMIT
+        # are kept, alongside the full counts
+        limit = app.config['ANALYSIS_CANDIDATE_LIMIT']
+        words, int_values = self._words(data)
+        float_values = words.view('<f4')
+        
+        float_mask = (float_values > -1000) & (float_values < 1000)  # Reasonable range
+        values = float_values[float_mask]
+        keep, positions = self._file_positions(np.flatnonzero(float_mask) * 4, 4)
+        positions, values = positions[keep], values[keep]
+        patterns['float_candidates'] = RecordList(position=positions[:limit], value=values[:limit])
+        patterns['float_candidate_count'] = len(positions)
+        
+        int_mask = (int_values >= 0) & (int_values < 1000000)  # Reasonable range
+        values = int_values[int_mask]
+        keep, positions = self._file_positions(np.flatnonzero(int_mask) * 4, 4)
+        positions, values = positions[keep], values[keep]
+        patterns['int_candidates'] = RecordList(position=positions[:limit], value=values[:limit])
+        patterns['int_candidate_count'] = len(positions)
         
         self.analysis_data['data_patterns']['binary_patterns'] = patterns
-        self.logger.info(f"Found {len(patterns['zero_sequences'])} zero sequences, {len(patterns['float_candidates'])} float candidates")
+        self.logger.info(f"Found {len(patterns['zero_sequences'])} zero sequences, {patterns['float_candidate_count']} float candidates")
     
-    def _analyze_data_structures(self, data):
-        """Analyze potential data structures"""
+    def _analyze_data_structures(self, data, file_size):
+        """Analyze potential data structures, checking offsets and sizes against the whole file's size"""
         self.logger.info("Analyzing data structures...")
         
         structures = {
@@ -1575,29 +1829,19 @@ class ReverseEngineerCLY:
             'size_fields': []
         }
         
-        # Look for potential header structures (first 256 bytes)
-        header_region = data[:256]
-        for i in range(0, len(header_region) - 8, 4):
-            # Look for potential size/offset fields
-            val = struct.unpack('I', header_region[i:i+4])[0]
-            if 0 < val < len(data):
-                structures['potential_offsets'].append({
-                    'position': i,
-                    'value': val,
-                    'points_to_valid_range': True
-                })
+        # Look for potential header structures (first 256 bytes): 4-byte
+        # size/offset fields with at least 8 bytes of the region after them
+        words, _ = self._words(data)
+        header_words = words[:max(0, (min(len(data), 256) - 5) // 4)]
+        offsets = (header_words > 0) & (header_words < file_size)
+        structures['potential_offsets'] = RecordList(position=np.flatnonzero(offsets) * 4, value=header_words[offsets],
+                                                     points_to_valid_range=True)
         
-        # Look for size fields (reasonable file sizes)
-        for i in range(0, len(data) - 4, 4):
-            try:
-                size_val = struct.unpack('I', data[i:i+4])[0]
-                if 1000 <= size_val <= len(data):
-                    structures['size_fields'].append({
-                        'position': i,
-                        'size': size_val
-                    })
-            except:
-                pass
+        # Look for size fields (reasonable file sizes) in every 4-byte stride
+        # that has at least one byte after it
+        sizes = (words >= 1000) & (words <= file_size)
+        keep, positions = self._file_positions(np.flatnonzero(sizes) * 4, 4)
+        structures['size_fields'] = RecordList(position=positions[keep], size=words[sizes][keep])
         
         self.analysis_data['structure_analysis']['data_structures'] = structures
         self.logger.info(f"Found {len(structures['potential_offsets'])} potential offsets, {len(structures['size_fields'])} size fields")
@@ -1607,19 +1851,11 @@ class ReverseEngineerCLY:
         self.logger.info("Analyzing data chunks...")
         
         chunks = []
+        signature_positions = self._signature_positions(data)
         
         # Look for chunk boundaries (common patterns)
-        chunk_markers = [b'\x00\x00\x00\x00', b'\xFF\xFF\xFF\xFF', b'\x00\x00\x00\x01']
-        
-        for marker in chunk_markers:
-            positions = []
-            start = 0
-            while True:
-                pos = data.find(marker, start)
-                if pos == -1:
-                    break
-                positions.append(pos)
-                start = pos + 1
+        for marker in CHUNK_MARKERS:
+            positions = signature_positions[marker]
             
             if len(positions) > 1:
                 # Analyze gaps between markers
@@ -1674,11 +1910,12 @@ class ReverseEngineerCLY:
     def _save_analysis_results(self):
         """Save analysis results to a conversion-logic file"""
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        filename = f"conversion-logic_{timestamp}.json"
+        # Compressed as it is written, so /analysis/<timestamp> can serve it as is
+        filename = analysis_results_path(timestamp)
         
         try:
-            with open(filename, 'w') as f:
-                json.dump(self.analysis_data, f, indent=2, default=str)
+            dump_json(self.analysis_data, filename)
+            self.results_timestamp = timestamp
             
             self.logger.info(f"Analysis results saved to: {filename}")
             
@@ -1696,8 +1933,7 @@ class ReverseEngineerCLY:
             }
             
             summary_filename = f"conversion-summary_{timestamp}.json"
-            with open(summary_filename, 'w') as f:
-                json.dump(summary, f, indent=2, default=str)
+            dump_json(summary, summary_filename)
             
             self.logger.info(f"Summary saved to: {summary_filename}")
             
@@ -1706,30 +1942,70 @@ class ReverseEngineerCLY:
     
     def _extract_ascii_from_binary(self, data):
         """Extract ASCII strings from binary data"""
-        ascii_chars = []
-        for byte in data:
-            if 32 <= byte <= 126:  # Printable ASCII
-                ascii_chars.append(chr(byte))
-            else:
-                ascii_chars.append('.')
-        return ''.join(ascii_chars)
+        return bytes(data).translate(ASCII_DOTS).decode('ascii')
     
     def _find_repeating_patterns(self, data, min_length=4):
         """Find repeating patterns in data"""
         patterns = []
         for length in range(min_length, min(20, len(data)//2)):
-            for start in range(len(data) - length):
-                pattern = data[start:start+length]
-                count = data.count(pattern)
-                if count > 1:
+            windows = [data[start:start+length] for start in range(len(data) - length + 1)]
+            # Overlapping occurrences bound data.count from above, so only
+            # windows seen twice need counting; when no window of this length
+            # repeats, no longer one can either
+            occurrences = Counter(windows)
+            if max(occurrences.values()) < 2:
+                break
+            
+            counts = {}
+            for start, pattern in enumerate(windows[:-1]):
+                if occurrences[pattern] < 2:
+                    continue
+                if pattern not in counts:
+                    counts[pattern] = data.count(pattern)
+                if counts[pattern] > 1:
                     patterns.append({
                         'pattern': pattern.hex(),
                         'length': length,
-                        'count': count,
+                        'count': counts[pattern],
                         'first_position': start
                     })
+                    if len(patterns) == 10:
+                        return patterns
         return patterns[:10]  # Limit to top 10
 
+def _requested_cly_file(label):
+    """Return (file, None) for the request's uploaded .cly file, or (None, error response)"""
+    if 'file' not in request.files:
+        logger.error("No file in request")
+        return None, (jsonify({'error': 'No file uploaded'}), 400)
+    
+    file = request.files['file']
+    if file.filename == '':
+        logger.error("No filename provided")
+        return None, (jsonify({'error': 'No file selected'}), 400)
+    
+    logger.info(f"{label}: {file.filename}")
+    
+    if not CLY_SUFFIX_RE.search(file.filename):
+        logger.error(f"Invalid file type: {file.filename}")
+        return None, (jsonify({'error': 'Please upload a .cly file'}), 400)
+    
+    return file, None
+
+def _save_upload(file, file_path):
+    """Save the uploaded file to file_path, logging where it went and its size, and return its content digest"""
+    # Hash each chunk as it is copied, so the parse cache key costs no
+    # extra pass over the saved file
+    digest = hashlib.blake2b(digest_size=16)
+    with open(file_path, 'wb') as f:
+        for chunk in iter(lambda: file.stream.read(UPLOAD_CHUNK), b''):
+            digest.update(chunk)
+            f.write(chunk)
+    
+    logger.info(f"File saved to: {file_path}")
+    logger.info(f"File size: {os.path.getsize(file_path)} bytes")
+    return digest.hexdigest()
+
 @app.route('/')
 def index():
     return render_template('index.html')
@@ -1739,34 +2015,20 @@ def analyze_file():
     """Route to trigger reverse engineering analysis without conversion"""
     logger.info("=== File Analysis Request ===")
     
-    if 'file' not in request.files:
-        logger.error("No file in request")
-        return jsonify({'error': 'No file uploaded'}), 400
-    
-    file = request.files['file']
-    if file.filename == '':
-        logger.error("No filename provided")
-        return jsonify({'error': 'No file selected'}), 400
+    file, error = _requested_cly_file("Analyzing file")
+    if error:
+        return error
     
-    logger.info(f"Analyzing file: {file.filename}")
-    logger.info(f"File size: {len(file.read())} bytes")
-    file.seek(0)  # Reset file pointer
-    
-    if not file.filename.lower().endswith('.cly'):
-        logger.error(f"Invalid file type: {file.filename}")
-        return jsonify({'error': 'Please upload a .cly file'}), 400
+    filename = secure_filename(file.filename)
+    file_path = os.path.join(app.config['UPLOAD_FOLDER'], filename)
     
     try:
-        # Save uploaded file
-        filename = secure_filename(file.filename)
-        file_path = os.path.join(app.config['UPLOAD_FOLDER'], filename)
-        file.save(file_path)
-        
-        logger.info(f"File saved to: {file_path}")
+        _save_upload(file, file_path)
         
         # Perform reverse engineering analysis
         analyzer = ReverseEngineerCLY()
-        analysis_result = analyzer.reverse_engineer_cly_file(file_path)
+        full = request.args.get('full') == '1'  # Exhaustive scan even for large files
+        analysis_result = analyzer.reverse_engineer_cly_file(file_path, full=full)
         
         if analysis_result:
             logger.info("Analysis completed successfully")
@@ -1774,6 +2036,8 @@ def analyze_file():
                 'success': True,
                 'message': 'Analysis completed successfully',
                 'file_size_mb': analysis_result['file_info']['file_size_mb'],
+                'analysis_url': f'/analysis/{analyzer.results_timestamp}' if analyzer.results_timestamp else None,
+                'sampled': analysis_result['file_info'].get('sampled', False),
                 'insights_count': len(analysis_result['conversion_insights']),
                 'conversion_insights': analysis_result['conversion_insights'],
                 'key_findings': {
@@ -1814,43 +2078,48 @@ def download_file(filename):
         logger.error(f"Error downloading file {filename}: {e}")
         return jsonify({'error': f'Download error: {str(e)}'}), 500
 
+@app.route('/analysis/<timestamp>')
+def download_analysis(timestamp):
+    """Route to fetch the full results of an analysis, gzip-encoded when the client accepts it"""
+    file_path = os.path.abspath(analysis_results_path(timestamp))
+    if not ANALYSIS_TIMESTAMP_RE.fullmatch(timestamp) or not os.path.exists(file_path):
+        return jsonify({'error': 'Analysis not found'}), 404
+    
+    try:
+        if 'gzip' in request.accept_encodings:
+            # The saved file is already gzip, so it is sent without recompressing
+            response = send_file(file_path, mimetype='application/json', conditional=True)
+            response.headers['Content-Encoding'] = 'gzip'
+        else:
+            response = send_file(gzip.open(file_path, 'rb'), mimetype='application/json')
+        response.vary.add('Accept-Encoding')
+        return response
+    except Exception as e:
+        logger.error(f"Error sending analysis {timestamp}: {e}")
+        return jsonify({'error': f'Download error: {str(e)}'}), 500
+
 @app.route('/upload', methods=['POST'])
 def upload_file():
     logger.info("=== File Upload Request ===")
     
-    if 'file' not in request.files:
-        logger.error("No file in request")
-        return jsonify({'error': 'No file uploaded'}), 400
-    
-    file = request.files['file']
-    if file.filename == '':
-        logger.error("No filename provided")
-        return jsonify({'error': 'No file selected'}), 400
-    
-    logger.info(f"Uploaded file: {file.filename}")
-    logger.info(f"File size: {len(file.read())} bytes")
-    file.seek(0)  # Reset file pointer
+    file, error = _requested_cly_file("Uploaded file")
+    if error:
+        return error
     
-    if not file.filename.lower().endswith('.cly'):
-        logger.error(f"Invalid file type: {file.filename}")
-        return jsonify({'error': 'Please upload a .cly file'}), 400
+    filename = secure_filename(file.filename)
+    file_path = os.path.join(app.config['UPLOAD_FOLDER'], filename)
     
     try:
-        # Save uploaded file
-        filename = secure_filename(file.filename)
-        file_path = os.path.join(app.config['UPLOAD_FOLDER'], filename)
-        file.save(file_path)
-        
-        logger.info(f"File saved to: {file_path}")
+        content_digest = _save_upload(file, file_path)
         
         # Parse the .cly file
-        parser = CLYParser(file_path)
+        parser = CLYParser(file_path, content_digest)
         if not parser.parse():
             logger.error("Failed to parse .cly file")
             return jsonify({'error': 'Failed to parse .cly file'}), 400
         
         # Export to STL
-        output_filename = filename.replace('.cly', '.stl')
+        output_filename = CLY_SUFFIX_RE.sub('.stl', filename)
         output_path = os.path.join(app.config['OUTPUT_FOLDER'], output_filename)
         
         format_type = request.form.get('format', 'ascii')
@@ -15,6 +15,15 @@ class Config:
     LOG_LEVEL = 'DEBUG'
     LOG_FILE = 'cly_converter.log'
     
+    # Parsing
+    PARSE_CACHE_SIZE = 32  # Parse results kept in memory, keyed by file content
+    
+    # Analysis
+    ANALYSIS_SAMPLE_THRESHOLD = 50 * 1024 * 1024  # Files above this are analyzed from samples unless ?full=1
+    ANALYSIS_SAMPLE_WINDOW = 1024 * 1024  # Bytes per sample window, rounded down to a multiple of 4
+    ANALYSIS_SAMPLE_COUNT = 10  # Evenly spaced windows, including the first and last
+    ANALYSIS_CANDIDATE_LIMIT = 10000  # Float/int candidates written per analysis; the full counts are kept
+    
     # Server settings
     HOST = '0.0.0.0'
     PORT = 5000
@@ -3,10 +3,16 @@
 Simple test script for the CLY to STL converter
 """
 
+import gzip
+import hashlib
+import io
+import json
 import os
 import tempfile
 import numpy as np
-from app import CLYParser
+from werkzeug.datastructures import FileStorage
+from app import (RECORD_BATCH, CLYParser, ParseCache, RecordList, ReverseEngineerCLY, _save_upload,
+                 analysis_results_path, app, dump_json)
 
 def create_test_cly_file():
     """Create a simple test .cly file for testing"""
@@ -58,5 +64,245 @@ def test_parser():
         if os.path.exists(test_file):
             os.remove(test_file)
 
+def test_parse_cache_hit():
+    """Test that re-parsing an upload with the same content digest reuses the cached, read-only mesh"""
+    print("Testing parse cache hit...")
+    
+    test_file = create_test_cly_file()
+    saved_file = test_file + '.saved'
+    
+    try:
+        # The digest is computed while the upload is saved
+        with open(test_file, 'rb') as f:
+            content = f.read()
+        digest = _save_upload(FileStorage(io.BytesIO(content), 'test.cly'), saved_file)
+        assert digest == hashlib.blake2b(content, digest_size=16).hexdigest()
+        
+        first = CLYParser(saved_file, digest)
+        second = CLYParser(test_file, digest)
+        assert first.parse() and second.parse()
+        
+        assert second.vertices is first.vertices
+        assert second.faces is first.faces
+        assert second.metadata == first.metadata
+        assert not first.vertices.flags.writeable
+        assert not first.faces.flags.writeable
+        
+        # Without a digest the file is parsed afresh and nothing is cached
+        uncached = CLYParser(test_file)
+        assert uncached.parse()
+        assert uncached.vertices is not first.vertices
+        print("✅ Parse cache hit test passed!")
+    
+    finally:
+        for path in (test_file, saved_file):
+            if os.path.exists(path):
+                os.remove(path)
+
+def test_parse_cache_eviction():
+    """Test that the parse cache drops its least recently used entry"""
+    print("Testing parse cache eviction...")
+    
+    cache = ParseCache(2)
+    cache.put('a', 1)
+    cache.put('b', 2)
+    assert cache.get('a') == 1  # 'a' is now the most recently used
+    cache.put('c', 3)
+    
+    assert cache.get('b') is None
+    assert cache.get('a') == 1
+    assert cache.get('c') == 3
+    print("✅ Parse cache eviction test passed!")
+
+def create_test_analysis(timestamp):
+    """Save small analysis results the way the analyzer does, returning them"""
+    results = {'conversion_insights': ['Test insight']}
+    dump_json(results, analysis_results_path(timestamp))
+    return results
+
+def test_download_analysis_gzip():
+    """Test that saved analysis results are sent as is to clients accepting gzip"""
+    print("Testing gzip analysis download...")
+    
+    timestamp = '20000101_000000'
+    results = create_test_analysis(timestamp)
+    
+    try:
+        response = app.test_client().get(f'/analysis/{timestamp}', headers={'Accept-Encoding': 'gzip'})
+        assert response.status_code == 200
+        assert response.headers['Content-Encoding'] == 'gzip'
+        assert 'Accept-Encoding' in response.vary
+        assert json.loads(gzip.decompress(response.data)) == results
+        response.close()
+        print("✅ Gzip analysis download test passed!")
+    
+    finally:
+        os.remove(analysis_results_path(timestamp))
+
+def test_download_analysis_identity():
+    """Test that saved analysis results are decompressed for clients not accepting gzip"""
+    print("Testing plain analysis download...")
+    
+    timestamp = '20000101_000001'
+    results = create_test_analysis(timestamp)
+    
+    try:
+        response = app.test_client().get(f'/analysis/{timestamp}', headers={'Accept-Encoding': 'identity'})
+        assert response.status_code == 200
+        assert 'Content-Encoding' not in response.headers
+        assert 'Accept-Encoding' in response.vary
+        assert json.loads(response.data) == results
+        response.close()
+        print("✅ Plain analysis download test passed!")
+    
+    finally:
+        os.remove(analysis_results_path(timestamp))
+
+def test_download_analysis_not_found():
+    """Test that malformed timestamps and missing results are both 404s"""
+    print("Testing missing analysis downloads...")
+    
+    # A file matching the name pattern exists, but the timestamp is malformed
+    create_test_analysis('latest')
+    
+    try:
+        client = app.test_client()
+        assert client.get('/analysis/latest').status_code == 404
+        assert client.get('/analysis/2000-01-01').status_code == 404
+        assert client.get('/analysis/20000101_000002').status_code == 404
+        print("✅ Missing analysis download test passed!")
+    
+    finally:
+        os.remove(analysis_results_path('latest'))
+
+def create_sampled_cly_file():
+    """Create a .cly file with CLYF signatures inside and between the sample windows used below"""
+    data = bytearray(b'\x01' * 10000)
+    for offset in (2000, 5000, 9000):
+        data[offset:offset + 4] = b'CLYF'
+    # The first window ends with 'CL' and the second starts with 'YF', so
+    # joining the windows would make up a signature at the seam
+    data[1022:1024] = b'CL'
+    data[4488:4490] = b'YF'
+    
+    with tempfile.NamedTemporaryFile(suffix='.cly', delete=False) as f:
+        f.write(data)
+        return f.name
+
+def remove_analysis_results(timestamp):
+    """Remove the files saved by an analysis"""
+    for path in (analysis_results_path(timestamp), f"conversion-summary_{timestamp}.json"):
+        if timestamp and os.path.exists(path):
+            os.remove(path)
+
+def test_sampled_analysis():
+    """Test that sampled analysis reports file offsets and that ?full=1 scans the whole file"""
+    print("Testing sampled analysis...")
+    
+    test_file = create_sampled_cly_file()
+    saved_config = {key: app.config[key] for key in ('ANALYSIS_SAMPLE_THRESHOLD', 'ANALYSIS_SAMPLE_WINDOW', 'ANALYSIS_SAMPLE_COUNT')}
+    # Windows of 1024 bytes at file offsets 0, 4488 and 8976
+    app.config.update(ANALYSIS_SAMPLE_THRESHOLD=4096, ANALYSIS_SAMPLE_WINDOW=1024, ANALYSIS_SAMPLE_COUNT=3)
+    
+    try:
+        for full, expected in ((False, [5000, 9000]), (True, [2000, 5000, 9000])):
+            analyzer = ReverseEngineerCLY()
+            result = analyzer.reverse_engineer_cly_file(test_file, full=full)
+            remove_analysis_results(analyzer.results_timestamp)
+            
+            assert result['file_info'].get('sampled', False) == (not full)
+            magics = {magic['magic']: magic['positions'] for magic in result['data_patterns']['magic_numbers']}
+            assert magics[b'CLYF'.hex()] == expected
+        
+        # A window that is not a whole number of words is rounded down to
+        # one, and windows that would cover the file fall back to a full scan
+        for window, count, expected in ((1027, 3, [5000, 9000]), (4000, 3, [2000, 5000, 9000])):
+            app.config.update(ANALYSIS_SAMPLE_WINDOW=window, ANALYSIS_SAMPLE_COUNT=count)
+            analyzer = ReverseEngineerCLY()
+            result = analyzer.reverse_engineer_cly_file(test_file)
+            remove_analysis_results(analyzer.results_timestamp)
+            
+            magics = {magic['magic']: magic['positions'] for magic in result['data_patterns']['magic_numbers']}
+            assert magics[b'CLYF'.hex()] == expected
+            assert result['file_info'].get('sampled', False) == (len(expected) == 2)
+        app.config.update(ANALYSIS_SAMPLE_WINDOW=1024, ANALYSIS_SAMPLE_COUNT=3)
+        
+        client = app.test_client()
+        for query, sampled in (('', True), ('?full=1', False)):
+            with open(test_file, 'rb') as f:
+                response = client.post(f'/analyze{query}', data={'file': (f, 'sampled.cly')})
+            assert response.status_code == 200
+            assert response.json['sampled'] == sampled
+            remove_analysis_results(response.json['analysis_url'].rsplit('/', 1)[-1])
+        print("✅ Sampled analysis test passed!")
+    
+    finally:
+        app.config.update(saved_config)
+        if os.path.exists(test_file):
+            os.remove(test_file)
+
+def test_candidate_limit():
+    """Test that only the first ANALYSIS_CANDIDATE_LIMIT candidates are saved, with their full counts"""
+    print("Testing candidate limit...")
+    
+    with tempfile.NamedTemporaryFile(suffix='.cly', delete=False) as f:
+        f.write(bytes(4000))  # Every word reads as the float and int 0
+        test_file = f.name
+    saved_limit = app.config['ANALYSIS_CANDIDATE_LIMIT']
+    app.config['ANALYSIS_CANDIDATE_LIMIT'] = 5
+    
+    try:
+        analyzer = ReverseEngineerCLY()
+        analyzer.reverse_engineer_cly_file(test_file)
+        with gzip.open(analysis_results_path(analyzer.results_timestamp), 'rt') as results:
+            text = results.read()
+        remove_analysis_results(analyzer.results_timestamp)
+        
+        assert '\n' not in text  # The gzip-compressed results are written compactly
+        patterns = json.loads(text)['data_patterns']['binary_patterns']
+        for name in ('float_candidates', 'int_candidates'):
+            assert [candidate['position'] for candidate in patterns[name]] == [0, 4, 8, 12, 16]
+            assert patterns[name.replace('candidates', 'candidate_count')] == 999
+        print("✅ Candidate limit test passed!")
+    
+    finally:
+        app.config['ANALYSIS_CANDIDATE_LIMIT'] = saved_limit
+        if os.path.exists(test_file):
+            os.remove(test_file)
+
+def test_dump_json_records():
+    """Test that RecordLists are written across batches and unknown types are rejected"""
+    print("Testing JSON record writing...")
+    
+    path = analysis_results_path('20000101_000003')
+    count = RECORD_BATCH * 2 + 1
+    
+    try:
+        dump_json({'records': RecordList(position=np.arange(count), valid=True), 'empty': RecordList(position=np.arange(0))}, path)
+        with gzip.open(path, 'rt') as f:
+            written = json.load(f)
+        assert written['records'] == [{'position': i, 'valid': True} for i in range(count)]
+        assert written['empty'] == []
+        
+        try:
+            dump_json({'value': object()}, path)
+        except TypeError:
+            pass
+        else:
+            raise AssertionError("dump_json wrote an object it cannot encode")
+        print("✅ JSON record writing test passed!")
+    
+    finally:
+        if os.path.exists(path):
+            os.remove(path)
+
 if __name__ == '__main__':
-    test_parser() 
\ No newline at end of file
+    test_parser()
+    test_parse_cache_hit()
+    test_parse_cache_eviction()
+    test_download_analysis_gzip()
+    test_download_analysis_identity()
+    test_download_analysis_not_found()
+    test_sampled_analysis()
+    test_candidate_limit()
+    test_dump_json_records() 
\ No newline at end of file
@@ -6,6 +6,7 @@ class Config:
     # Flask settings
     SECRET_KEY = os.environ.get('SECRET_KEY') or 'dev-secret-key-change-in-production'
     MAX_CONTENT_LENGTH = 500 * 1024 * 1024  # 500MB max file size (increased from 100MB)
+    UPLOAD_SPOOL_SIZE = 64 * 1024 * 1024  # Uploads larger than 64MB are spooled to disk
     
     # File paths
     UPLOAD_FOLDER = 'uploads'
@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+"""
+Simple test script for the CLY to STL converter's upload route
+"""
+
+import io
+import os
+import tempfile
+from app import CLYParser, UploadSpool, app
+
+TEST_CLY_CONTENT = b"""format FreeStyle Workspace (FWP)
+version FreeForm Modeling/135/Tue Dec 29 10:12:32 2009/V10.0
+units mm
+modelDimensions 10.0 10.0 10.0
+bitmap 0 1000
+fileVersion 4
+coarseTerm -1
+endHeader
+
+FFDYNPKTObjectListMain
+FFDYNPKTModelInfo
+numVoxels 1000
+numTris 100
+"""
+
+def expected_stl(content, ascii_format):
+    """Return the STL the parser writes for content read from a file on disk"""
+    with tempfile.NamedTemporaryFile(suffix='.cly', delete=False) as f:
+        f.write(content)
+    
+    try:
+        parser = CLYParser(f.name)
+        assert parser.parse()
+        return parser.export_stl_to_buffer(ascii_format).getvalue()
+    finally:
+        os.remove(f.name)
+
+def post_upload(filename, content, format_type):
+    """Post content to /upload as filename, returning the response"""
+    return app.test_client().post('/upload', data={
+        'file': (io.BytesIO(content), filename),
+        'format': format_type
+    })
+
+def test_upload_spool():
+    """Test that the upload spool records when it rolls over to disk"""
+    print("Testing upload spool...")
+    
+    with UploadSpool(max_size=8, mode='rb+') as spool:
+        spool.write(b'1234')
+        assert spool.in_memory()
+        try:
+            spool.fileno()
+        except io.UnsupportedOperation:
+            pass
+        else:
+            raise AssertionError("an in-memory spool handed out a file descriptor")
+    
+        spool.write(b'56789')
+        assert not spool.in_memory()
+        assert spool.fileno() >= 0
+    print("✅ Upload spool test passed!")
+
+def test_upload_in_memory():
+    """Test converting an upload parsed from memory, named after the .cly file in any case"""
+    print("Testing in-memory upload...")
+    
+    for format_type in ('ascii', 'binary'):
+        response = post_upload('Model.CLY', TEST_CLY_CONTENT, format_type)
+        assert response.status_code == 200
+        assert response.headers['Content-Disposition'] == 'attachment; filename=Model.stl'
+        assert response.data == expected_stl(TEST_CLY_CONTENT, format_type == 'ascii')
+    print("✅ In-memory upload test passed!")
+
+def test_upload_rolled_over():
+    """Test converting an upload that was spooled to disk"""
+    print("Testing rolled-over upload...")
+    
+    saved_size = app.config['UPLOAD_SPOOL_SIZE']
+    app.config['UPLOAD_SPOOL_SIZE'] = 16
+    
+    try:
+        response = post_upload('model.cly.cly', TEST_CLY_CONTENT, 'binary')
+        assert response.status_code == 200
+        assert response.headers['Content-Disposition'] == 'attachment; filename=model.cly.stl'
+        assert response.data == expected_stl(TEST_CLY_CONTENT, False)
+        print("✅ Rolled-over upload test passed!")
+    
+    finally:
+        app.config['UPLOAD_SPOOL_SIZE'] = saved_size
+
+def test_upload_rejects_other_files():
+    """Test that only .cly uploads are accepted"""
+    print("Testing upload file type check...")
+    
+    for filename in ('model.stl', 'model.cly.txt'):
+        assert post_upload(filename, TEST_CLY_CONTENT, 'binary').status_code == 400
+    print("✅ Upload file type check test passed!")
+
+def test_long_header():
+    """Test that a header longer than one read block ends only at an exact endHeader line"""
+    print("Testing long header...")
+    
+    header = (b"format FreeStyle Workspace (FWP)\n"
+              + b"".join(b"comment %d padding the header past one block\n" % i for i in range(20))
+              + b"note " + b"x" * 9000 + b"\n"
+              + b"endHeaderOffset=0\n"
+              + b"units mm\n"
+              + b"  endHeader \r\n")
+    parser = CLYParser('<bytes>')
+    
+    assert len(header) > 8192
+    assert parser.parse_header(header + b"FFDYNPKTObjectListMain\n") == len(header)
+    assert parser.metadata['units'] == 'mm'
+    print("✅ Long header test passed!")
+
+if __name__ == '__main__':
+    test_upload_spool()
+    test_upload_in_memory()
+    test_upload_rolled_over()
+    test_upload_rejects_other_files()
+    test_long_header()